@@ -6,6 +6,9 @@ from adbutils import adb, adb_path
 
 from msc.screencap import ScreenCap
 
+# screencap 输出头部长度：API 28 以下为 12 字节，API 28 起为 16 字节
+_SCREENCAP_HEADER_SIZES = (12, 16)
+
 
 def _run_adb_command(command: list[str], timeout: float = 10.0) -> bytes:
     """
@@ -41,18 +44,43 @@ def _run_adb_command(command: list[str], timeout: float = 10.0) -> bytes:
 
 
 class ADBCap(ScreenCap):
-    def __init__(self, serial: str, display_id: int = None):
+    def __init__(self, serial: str, display_id: int = None, use_png: bool = False):
         """
           __init__ ADB 截图方式
 
           Args:
               serial (str): 设备id
+              use_png (bool, optional): screencap() 是否改用 `screencap -p` 传输 PNG.
+                  适用于 USB 带宽受限的真机；模拟器等本地连接下原始 RGBA 通常更快. Defaults to False.
           """
         self.adb = adb.device(serial)
         self.display_id = display_id
+        self.use_png = use_png
         self.width, self.height = self.adb.window_size()
         # 计算预期的数据长度
         self.buffer_size = self.width * self.height * 4
+        self._frame_shape = (self.height, self.width, 4)
+        # 预先构建截图命令，避免每次截图都重新查找 adb 可执行文件
+        self._screencap_command = [adb_path(), "-s", self.adb.serial, "exec-out", "screencap"]
+        self._screencap_png_command = self._screencap_command + ["-p"]
+        if self.display_id:
+            self._screencap_command.extend(["-d", str(self.display_id)])
+            self._screencap_png_command.extend(["-d", str(self.display_id)])
+
+    def _screencap_with_header(self) -> tuple[bytes, int]:
+        """
+          执行 screencap 并返回原始输出及其头部长度。
+
+          screencap 会在像素数据前写入头部：width、height、format 共 12 字节，
+          Android 9 (API 28) 起追加 colorspace 变为 16 字节。
+
+          :return: (adb 输出, 像素数据起始偏移)
+          """
+        raw = _run_adb_command(self._screencap_command)
+        header_size = len(raw) - self.buffer_size
+        if header_size not in _SCREENCAP_HEADER_SIZES:
+            header_size = 0
+        return raw, header_size
 
     def screencap_raw(self) -> bytes:
         """
@@ -60,27 +88,33 @@ class ADBCap(ScreenCap):
 
           :return: 截图的字节数据。
           """
-        adb_command = [adb_path(), "-s", self.adb.serial, "exec-out", "screencap"]
-        if self.display_id:
-            adb_command.extend(["-d", str(self.display_id)])
-        raw = _run_adb_command(adb_command)
-        
-        # Handle potential 12-byte header from screencap (width, height, format)
-        if len(raw) == self.buffer_size + 12:
-            return raw[12:]
-            
+        raw, header_size = self._screencap_with_header()
+        if header_size:
+            return raw[header_size:]
         return raw
 
     def screencap(self) -> cv2.Mat:
-        # 获取原始屏幕截图数据
-        raw = self.screencap_raw()
+        if self.use_png:
+            # PNG 由 OpenCV 直接解码为 BGR，无需额外颜色转换
+            png = _run_adb_command(self._screencap_png_command)
+            image = cv2.imdecode(np.frombuffer(png, np.uint8), cv2.IMREAD_COLOR)
+            if image is None:
+                raise ValueError("Failed to decode PNG screencap")
+            return image
 
-        # 检查实际数据长度是否符合预期
-        if len(raw) < self.buffer_size:
-            raise ValueError(f"Raw data length {len(raw)} is less than expected {self.buffer_size}")
+        # 获取原始屏幕截图数据（保留头部，通过偏移量跳过，避免复制）
+        raw, header_size = self._screencap_with_header()
 
-        # 将原始数据转换为 NumPy 数组
-        arr = np.frombuffer(raw[:self.buffer_size], np.uint8).reshape((self.height, self.width, 4))
+        # 检查实际数据长度是否符合预期
+        if len(raw) - header_size < self.buffer_size:
+            raise ValueError(
+                f"Raw data length {len(raw) - header_size} is less than expected {self.buffer_size}"
+            )
+
+        # 将原始数据转换为 NumPy 数组（直接在原始字节上建立视图，避免切片复制）
+        arr = np.frombuffer(
+            raw, np.uint8, count=self.buffer_size, offset=header_size
+        ).reshape(self._frame_shape)
 
         # 将 RGBA 格式转换为 BGR 格式
         return cv2.cvtColor(arr, cv2.COLOR_RGBA2BGR)
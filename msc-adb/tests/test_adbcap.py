@@ -100,3 +100,70 @@ def test_adbcap_screencap_converts_rgba_to_bgr(
     assert mat[0, 0].tolist() == [30, 20, 10]
     assert mat[0, 1].tolist() == [60, 50, 40]
 
+
+def test_adbcap_screencap_png_mode(monkeypatch: pytest.MonkeyPatch) -> None:
+    width, height = 2, 1
+
+    # BGR pixels as OpenCV would decode them
+    bgr = np.array([[[30, 20, 10], [60, 50, 40]]], dtype=np.uint8)
+    ok, png = cv2.imencode(".png", bgr)
+    assert ok
+    png_bytes = png.tobytes()
+
+    class DummyDevice:
+        def __init__(self, serial: str) -> None:
+            self.serial = serial
+
+        def window_size(self) -> tuple[int, int]:
+            return width, height
+
+    commands: list[list[str]] = []
+
+    def fake_run(cmd, timeout=10.0):  # type: ignore[override]
+        commands.append(cmd)
+        return png_bytes
+
+    monkeypatch.setattr(adbcap, "adb", SimpleNamespace(device=DummyDevice))
+    monkeypatch.setattr(adbcap, "adb_path", lambda: "adb")
+    monkeypatch.setattr(adbcap, "_run_adb_command", fake_run)
+
+    cap = ADBCap(serial="dummy-serial", display_id=2, use_png=True)
+    mat = cap.screencap()
+
+    assert commands == [
+        ["adb", "-s", "dummy-serial", "exec-out", "screencap", "-p", "-d", "2"]
+    ]
+    assert mat.shape == (height, width, 3)
+    assert mat[0, 0].tolist() == [30, 20, 10]
+    assert mat[0, 1].tolist() == [60, 50, 40]
+
+
+@pytest.mark.parametrize("header_size", [12, 16])
+def test_adbcap_skips_screencap_header(
+    monkeypatch: pytest.MonkeyPatch, header_size: int
+) -> None:
+    width, height = 2, 1
+
+    pixels = np.array(
+        [[[10, 20, 30, 255], [40, 50, 60, 255]]], dtype=np.uint8
+    )  # shape (1, 2, 4)
+    raw_bytes = b"\xff" * header_size + pixels.tobytes()
+
+    class DummyDevice:
+        def __init__(self, serial: str) -> None:
+            self.serial = serial
+
+        def window_size(self) -> tuple[int, int]:
+            return width, height
+
+    monkeypatch.setattr(adbcap, "adb", SimpleNamespace(device=DummyDevice))
+    monkeypatch.setattr(adbcap, "adb_path", lambda: "adb")
+    monkeypatch.setattr(adbcap, "_run_adb_command", lambda cmd, timeout=10.0: raw_bytes)
+
+    cap = ADBCap(serial="dummy-serial")
+
+    assert cap.screencap_raw() == pixels.tobytes()
+
+    mat = cap.screencap()
+    assert mat[0, 0].tolist() == [30, 20, 10]
+    assert mat[0, 1].tolist() == [60, 50, 40]
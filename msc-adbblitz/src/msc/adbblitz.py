@@ -1,6 +1,7 @@
 from typing import Iterator, Optional
 
 import cv2
+import numpy as np
 from adbutils import adb, adb_path
 from adbnativeblitz import AdbFastScreenshots
 from loguru import logger
@@ -39,6 +40,7 @@ class ADBBlitz(ScreenCap):
             buffer_size: Frame buffer size (number of frames to keep)
             go_idle: Idle time in seconds when no new frames available (higher = less CPU)
         """
+        self._closed = False
         self.serial = serial
         self.adb_device = adb.device(serial)
 
@@ -73,6 +75,9 @@ class ADBBlitz(ScreenCap):
         # Iterator for frame access
         self._frame_iterator = None
 
+        # Reusable RGBA buffer for screencap_raw conversions
+        self._rgba_buf = np.empty((self.height, self.width, 4), np.uint8)
+
         logger.info("ADBBlitz initialized successfully")
 
     def _get_frame_iterator(self) -> Iterator[cv2.Mat]:
@@ -97,6 +102,25 @@ class ADBBlitz(ScreenCap):
             logger.error("Frame capture stopped")
             raise RuntimeError("Frame capture has stopped")
 
+    def screencap_raw_view(self) -> memoryview:
+        """
+        Get latest frame as a view over the reusable RGBA buffer.
+
+        The view is valid until the next screencap_raw or screencap_raw_view call.
+
+        Returns:
+            memoryview: Raw RGBA bytes
+        """
+        frame = self.screencap()
+
+        if self._rgba_buf.shape[:2] != frame.shape[:2]:
+            self._rgba_buf = np.empty((frame.shape[0], frame.shape[1], 4), np.uint8)
+
+        # Convert BGR NumPy array to RGBA to match other backends,
+        # writing into the reusable buffer instead of a fresh array
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA, dst=self._rgba_buf)
+        return memoryview(self._rgba_buf).cast("B")
+
     def screencap_raw(self) -> bytes:
         """
         Get latest frame as raw bytes.
@@ -104,11 +128,7 @@ class ADBBlitz(ScreenCap):
         Returns:
             bytes: Raw RGBA bytes
         """
-        frame = self.screencap()
-
-        # Convert BGR NumPy array to RGBA bytes to match other backends
-        rgba_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA)
-        return rgba_frame.tobytes()
+        return bytes(self.screencap_raw_view())
 
     def __iter__(self) -> Iterator[cv2.Mat]:
         """
@@ -120,16 +140,24 @@ class ADBBlitz(ScreenCap):
         return self._get_frame_iterator()
 
     def close(self) -> None:
-        """Stop capture and release resources."""
+        """Stop capture and release resources. Safe to call more than once."""
+        if self._closed:
+            return
+        self._closed = True
+
         logger.info("Stopping ADBBlitz capture")
 
-        if self.adb_screenshots:
-            self.adb_screenshots.stop_capture()
+        adb_screenshots = getattr(self, "adb_screenshots", None)
+        if adb_screenshots:
+            adb_screenshots.stop_capture()
 
         logger.info("ADBBlitz capture stopped")
 
     def __del__(self) -> None:
         """Destructor to ensure cleanup."""
+        # Nothing to release if __init__ failed early or close() already ran
+        if getattr(self, "_closed", True):
+            return
         try:
             self.close()
         except Exception:
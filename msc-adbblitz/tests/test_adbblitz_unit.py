@@ -13,21 +13,27 @@ import pytest
 from msc.adbblitz import ADBBlitz
 
 
+@pytest.fixture
+def mock_adb():
+    """Patch msc.adbblitz.adb，设备默认报告 4x4 分辨率。"""
+    with patch("msc.adbblitz.adb") as mock_adb:
+        mock_device = Mock()
+        mock_device.serial = "test_serial"
+        mock_device.window_size.return_value = (4, 4)
+        mock_adb.device.return_value = mock_device
+        yield mock_adb
+
+
+@pytest.fixture
+def mock_adbnativeblitz():
+    """Patch msc.adbblitz.AdbFastScreenshots，return_value 即捕获实例 mock。"""
+    with patch("msc.adbblitz.AdbFastScreenshots") as mock_cls:
+        yield mock_cls
+
+
 @pytest.mark.unit
-@patch("msc.adbblitz.AdbFastScreenshots")
-@patch("msc.adbblitz.adb")
 def test_adbblitz_init_parameters(mock_adb, mock_adbnativeblitz):
     """测试初始化参数处理。"""
-    # Mock device
-    mock_device = Mock()
-    mock_device.serial = "test_serial"
-    mock_device.window_size.return_value = (1920, 1080)
-    mock_adb.device.return_value = mock_device
-
-    # Mock adbnativeblitz
-    mock_screenshots = Mock()
-    mock_adbnativeblitz.return_value = mock_screenshots
-
     # Create instance with custom parameters
     ab = ADBBlitz(
         serial="test_serial",
@@ -58,19 +64,9 @@ def test_adbblitz_init_parameters(mock_adb, mock_adbnativeblitz):
 
 
 @pytest.mark.unit
-@patch("msc.adbblitz.AdbFastScreenshots")
-@patch("msc.adbblitz.adb")
 def test_adbblitz_default_resolution(mock_adb, mock_adbnativeblitz):
     """测试默认分辨率使用设备尺寸。"""
-    # Mock device
-    mock_device = Mock()
-    mock_device.serial = "test_serial"
-    mock_device.window_size.return_value = (1920, 1080)
-    mock_adb.device.return_value = mock_device
-
-    # Mock adbnativeblitz
-    mock_screenshots = Mock()
-    mock_adbnativeblitz.return_value = mock_screenshots
+    mock_adb.device.return_value.window_size.return_value = (1920, 1080)
 
     # Create instance without specifying resolution
     ab = ADBBlitz(serial="test_serial")
@@ -95,11 +91,10 @@ def test_adbblitz_frame_buffer_management():
 
     buffer = deque(maxlen=5)
 
-    # Add frames
-    for i in range(10):
-        frame = np.zeros((100, 100, 3), dtype=np.uint8)
-        frame[:, :, 0] = i  # Mark frame with index
-        buffer.append(frame)
+    # Add frames, each marked with its index (content beyond pixel 0 is unused)
+    frames = np.empty((10, 2, 2, 3), dtype=np.uint8)
+    frames[:, 0, 0, 0] = np.arange(10)
+    buffer.extend(frames)
 
     # Should only keep last 5 frames
     assert len(buffer) == 5
@@ -110,24 +105,15 @@ def test_adbblitz_frame_buffer_management():
 
 
 @pytest.mark.unit
-@patch("msc.adbblitz.AdbFastScreenshots")
-@patch("msc.adbblitz.adb")
 def test_adbblitz_screencap(mock_adb, mock_adbnativeblitz):
     """测试 screencap() 获取帧。"""
-    # Mock device
-    mock_device = Mock()
-    mock_device.serial = "test_serial"
-    mock_device.window_size.return_value = (100, 100)
-    mock_adb.device.return_value = mock_device
-
     # Mock adbnativeblitz instance
-    mock_screenshots = Mock()
-    test_frame = np.zeros((100, 100, 3), dtype=np.uint8)
+    mock_screenshots = mock_adbnativeblitz.return_value
+    test_frame = np.zeros((4, 4, 3), dtype=np.uint8)
     test_frame[:, :, 0] = 255  # Blue channel
 
     # Mock iterator
     mock_screenshots.__iter__ = Mock(return_value=iter([test_frame]))
-    mock_adbnativeblitz.return_value = mock_screenshots
 
     ab = ADBBlitz(serial="test_serial")
 
@@ -136,31 +122,22 @@ def test_adbblitz_screencap(mock_adb, mock_adbnativeblitz):
 
     # Verify frame is returned
     assert frame is not None
-    assert frame.shape == (100, 100, 3)
+    assert frame.shape == (4, 4, 3)
     assert frame[0, 0, 0] == 255
 
     ab.close()
 
 
 @pytest.mark.unit
-@patch("msc.adbblitz.AdbFastScreenshots")
-@patch("msc.adbblitz.adb")
 def test_adbblitz_screencap_raw_conversion(mock_adb, mock_adbnativeblitz):
     """测试 screencap_raw 的格式转换。"""
-    # Mock device
-    mock_device = Mock()
-    mock_device.serial = "test_serial"
-    mock_device.window_size.return_value = (100, 100)
-    mock_adb.device.return_value = mock_device
-
     # Mock adbnativeblitz instance
-    mock_screenshots = Mock()
-    test_frame = np.zeros((100, 100, 3), dtype=np.uint8)
+    mock_screenshots = mock_adbnativeblitz.return_value
+    test_frame = np.zeros((4, 4, 3), dtype=np.uint8)
     test_frame[:, :, 2] = 255  # Red channel in BGR
 
     # Mock iterator to return test frame
     mock_screenshots.__iter__ = Mock(return_value=iter([test_frame]))
-    mock_adbnativeblitz.return_value = mock_screenshots
 
     ab = ADBBlitz(serial="test_serial")
 
@@ -168,10 +145,10 @@ def test_adbblitz_screencap_raw_conversion(mock_adb, mock_adbnativeblitz):
     raw_data = ab.screencap_raw()
 
     # Should be RGBA format
-    assert len(raw_data) == 100 * 100 * 4
+    assert len(raw_data) == 4 * 4 * 4
 
     # Verify conversion (BGR -> RGBA)
-    raw_array = np.frombuffer(raw_data, dtype=np.uint8).reshape((100, 100, 4))
+    raw_array = np.frombuffer(raw_data, dtype=np.uint8).reshape((4, 4, 4))
     assert raw_array[0, 0, 0] == 255  # Red channel
     assert raw_array[0, 0, 3] == 255  # Alpha channel
 
@@ -179,54 +156,35 @@ def test_adbblitz_screencap_raw_conversion(mock_adb, mock_adbnativeblitz):
 
 
 @pytest.mark.unit
-@patch("msc.adbblitz.AdbFastScreenshots")
-@patch("msc.adbblitz.adb")
 def test_adbblitz_iterator(mock_adb, mock_adbnativeblitz):
     """测试迭代器功能。"""
-    # Mock device
-    mock_device = Mock()
-    mock_device.serial = "test_serial"
-    mock_device.window_size.return_value = (100, 100)
-    mock_adb.device.return_value = mock_device
-
     # Mock adbnativeblitz instance
-    mock_screenshots = Mock()
+    mock_screenshots = mock_adbnativeblitz.return_value
     frames = [
-        np.zeros((100, 100, 3), dtype=np.uint8),
-        np.ones((100, 100, 3), dtype=np.uint8),
+        np.zeros((2, 2, 3), dtype=np.uint8),
+        np.ones((2, 2, 3), dtype=np.uint8),
     ]
 
     # Mock iterator
     mock_screenshots.__iter__ = Mock(return_value=iter(frames))
-    mock_adbnativeblitz.return_value = mock_screenshots
 
     ab = ADBBlitz(serial="test_serial")
 
     # Iterate and collect frames
     collected_frames = list(ab)
 
-    # Verify we got the frames
+    # Verify we got the frames (passed through without copying)
     assert len(collected_frames) == 2
-    assert np.array_equal(collected_frames[0], frames[0])
-    assert np.array_equal(collected_frames[1], frames[1])
+    assert collected_frames[0] is frames[0]
+    assert collected_frames[1] is frames[1]
 
     ab.close()
 
 
 @pytest.mark.unit
-@patch("msc.adbblitz.AdbFastScreenshots")
-@patch("msc.adbblitz.adb")
 def test_adbblitz_close_cleanup(mock_adb, mock_adbnativeblitz):
     """测试 close() 方法的资源清理。"""
-    # Mock device
-    mock_device = Mock()
-    mock_device.serial = "test_serial"
-    mock_device.window_size.return_value = (1920, 1080)
-    mock_adb.device.return_value = mock_device
-
-    # Mock adbnativeblitz instance
-    mock_screenshots = Mock()
-    mock_adbnativeblitz.return_value = mock_screenshots
+    mock_screenshots = mock_adbnativeblitz.return_value
 
     ab = ADBBlitz(serial="test_serial")
 
@@ -238,21 +196,12 @@ def test_adbblitz_close_cleanup(mock_adb, mock_adbnativeblitz):
 
 
 @pytest.mark.unit
-@patch("msc.adbblitz.AdbFastScreenshots")
-@patch("msc.adbblitz.adb")
 def test_adbblitz_context_manager(mock_adb, mock_adbnativeblitz):
     """测试上下文管理器功能。"""
-    # Mock device
-    mock_device = Mock()
-    mock_device.serial = "test_serial"
-    mock_device.window_size.return_value = (100, 100)
-    mock_adb.device.return_value = mock_device
-
     # Mock adbnativeblitz instance
-    mock_screenshots = Mock()
-    test_frame = np.zeros((100, 100, 3), dtype=np.uint8)
+    mock_screenshots = mock_adbnativeblitz.return_value
+    test_frame = np.zeros((4, 4, 3), dtype=np.uint8)
     mock_screenshots.__iter__ = Mock(return_value=iter([test_frame]))
-    mock_adbnativeblitz.return_value = mock_screenshots
 
     # Use as context manager
     with ADBBlitz(serial="test_serial") as ab:
@@ -264,20 +213,11 @@ def test_adbblitz_context_manager(mock_adb, mock_adbnativeblitz):
 
 
 @pytest.mark.unit
-@patch("msc.adbblitz.AdbFastScreenshots")
-@patch("msc.adbblitz.adb")
 def test_adbblitz_screencap_stop_iteration(mock_adb, mock_adbnativeblitz):
     """测试当迭代器停止时的错误处理。"""
-    # Mock device
-    mock_device = Mock()
-    mock_device.serial = "test_serial"
-    mock_device.window_size.return_value = (100, 100)
-    mock_adb.device.return_value = mock_device
-
     # Mock adbnativeblitz instance with empty iterator
-    mock_screenshots = Mock()
+    mock_screenshots = mock_adbnativeblitz.return_value
     mock_screenshots.__iter__ = Mock(return_value=iter([]))
-    mock_adbnativeblitz.return_value = mock_screenshots
 
     ab = ADBBlitz(serial="test_serial")
 
@@ -286,3 +226,71 @@ def test_adbblitz_screencap_stop_iteration(mock_adb, mock_adbnativeblitz):
         ab.screencap()
 
     ab.close()
+
+
+@pytest.mark.unit
+def test_adbblitz_screencap_raw_reuses_buffer(mock_adb, mock_adbnativeblitz):
+    """测试 screencap_raw 复用 RGBA 缓冲区，并在帧尺寸变化时重新分配。"""
+    # Frames of the configured size followed by a differently sized one
+    mock_screenshots = mock_adbnativeblitz.return_value
+    frames = [
+        np.full((4, 4, 3), 10, dtype=np.uint8),
+        np.full((4, 4, 3), 20, dtype=np.uint8),
+        np.full((2, 3, 3), 30, dtype=np.uint8),
+    ]
+    mock_screenshots.__iter__ = Mock(return_value=iter(frames))
+
+    ab = ADBBlitz(serial="test_serial")
+    buf = ab._rgba_buf
+
+    first = ab.screencap_raw()
+    second = ab.screencap_raw()
+
+    # Same buffer is reused, returned bytes are independent copies
+    assert ab._rgba_buf is buf
+    assert first[0] == 10
+    assert second[0] == 20
+
+    # Resized frame triggers reallocation
+    third = ab.screencap_raw()
+    assert len(third) == 2 * 3 * 4
+    assert ab._rgba_buf.shape == (2, 3, 4)
+
+    ab.close()
+
+
+@pytest.mark.unit
+def test_adbblitz_screencap_raw_view(mock_adb, mock_adbnativeblitz):
+    """测试 screencap_raw_view 返回复用缓冲区上的视图。"""
+    # Mock adbnativeblitz instance
+    mock_screenshots = mock_adbnativeblitz.return_value
+    test_frame = np.zeros((4, 4, 3), dtype=np.uint8)
+    test_frame[:, :, 2] = 255  # Red channel in BGR
+    mock_screenshots.__iter__ = Mock(return_value=iter([test_frame]))
+
+    ab = ADBBlitz(serial="test_serial")
+
+    view = ab.screencap_raw_view()
+
+    assert isinstance(view, memoryview)
+    assert view.nbytes == 4 * 4 * 4
+    # View shares memory with the reusable RGBA buffer
+    assert np.shares_memory(np.frombuffer(view, dtype=np.uint8), ab._rgba_buf)
+    assert view[0] == 255  # Red channel
+    assert view[3] == 255  # Alpha channel
+
+    ab.close()
+
+
+@pytest.mark.unit
+def test_adbblitz_close_idempotent(mock_adb, mock_adbnativeblitz):
+    """测试重复 close() 与析构只停止一次捕获。"""
+    mock_screenshots = mock_adbnativeblitz.return_value
+
+    with ADBBlitz(serial="test_serial") as ab:
+        pass
+
+    ab.close()
+    ab.__del__()
+
+    mock_screenshots.stop_capture.assert_called_once()
@@ -1,10 +1,16 @@
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional, Type
 from types import TracebackType
 
 import cv2
+import numpy as np
 
 class ScreenCap(ABC):
+    # 所有实例共享的后台保存线程池，首次异步保存时创建
+    _save_executor: Optional[ThreadPoolExecutor] = None
+    _save_executor_lock = threading.Lock()
 
     @abstractmethod
     def screencap_raw(self) -> bytes:
@@ -15,6 +21,18 @@ class ScreenCap(ABC):
             bytes: 原始图像数据。具体格式取决于实现（通常为 RGBA 或 RGB）。
         """
 
+    def screencap_raw_view(self) -> memoryview:
+        """
+        获取屏幕截图原始数据的只读视图。
+
+        默认实现包装 `screencap_raw()` 的结果；持有可复用缓冲区的实现可以重写此方法，
+        直接返回缓冲区视图以避免额外复制。视图内容仅在下一次截图调用前有效。
+
+        Returns:
+            memoryview: 与 `screencap_raw()` 格式一致的原始图像数据。
+        """
+        return memoryview(self.screencap_raw())
+
     @abstractmethod
     def screencap(self) -> cv2.Mat:
         """
@@ -24,6 +42,22 @@ class ScreenCap(ABC):
             cv2.Mat: BGR 格式的图像数据。
         """
 
+    def screencap_into(self, out: np.ndarray) -> np.ndarray:
+        """
+        获取 OpenCV 格式的屏幕截图并写入调用方提供的缓冲区。
+
+        默认实现复制 `screencap()` 的结果；能够直接转换到目标缓冲区的实现可以重写此方法，
+        省去每帧分配新数组。
+
+        Args:
+            out (np.ndarray): 形状为 (H, W, 3)、dtype 为 uint8 的 BGR 缓冲区。
+
+        Returns:
+            np.ndarray: 写入后的 `out`。
+        """
+        np.copyto(out, self.screencap())
+        return out
+
     def save_screencap(self, filename="screencap.png"):
         """
         save_screencap 保存截图
@@ -33,6 +67,31 @@ class ScreenCap(ABC):
         """
         cv2.imwrite(filename, self.screencap())
 
+    def save_screencap_async(self, filename="screencap.png") -> Future:
+        """
+        save_screencap_async 截图并在后台线程中编码保存
+
+        截图在调用线程中完成，图像编码与写文件交由共享线程池执行，
+        cv2.imwrite 会释放 GIL，因此不会阻塞后续截图。
+
+        Args:
+            filename (str, optional): 截图保存路径. Defaults to "screencap.png".
+
+        Returns:
+            Future: 保存完成后结果为 cv2.imwrite 的返回值。
+        """
+        image = self.screencap()
+        return self._get_save_executor().submit(cv2.imwrite, filename, image)
+
+    @staticmethod
+    def _get_save_executor() -> ThreadPoolExecutor:
+        with ScreenCap._save_executor_lock:
+            if ScreenCap._save_executor is None:
+                ScreenCap._save_executor = ThreadPoolExecutor(
+                    max_workers=2, thread_name_prefix="msc-save"
+                )
+            return ScreenCap._save_executor
+
     def close(self) -> None:
         """释放资源"""
         pass
@@ -0,0 +1,50 @@
+import cv2
+import numpy as np
+import pytest
+
+from msc.screencap import ScreenCap
+
+pytestmark = pytest.mark.unit
+
+
+class _DummyCap(ScreenCap):
+    def __init__(self) -> None:
+        self.image = np.zeros((2, 3, 3), dtype=np.uint8)
+        self.image[:, :, 2] = 255  # Red in BGR
+
+    def screencap_raw(self) -> bytes:
+        return cv2.cvtColor(self.image, cv2.COLOR_BGR2RGBA).tobytes()
+
+    def screencap(self) -> cv2.Mat:
+        return self.image.copy()
+
+
+def test_screencap_raw_view_wraps_raw_bytes() -> None:
+    cap = _DummyCap()
+
+    view = cap.screencap_raw_view()
+
+    assert isinstance(view, memoryview)
+    assert view.tobytes() == cap.screencap_raw()
+
+
+def test_screencap_into_copies_into_buffer() -> None:
+    cap = _DummyCap()
+    out = np.empty((2, 3, 3), dtype=np.uint8)
+
+    result = cap.screencap_into(out)
+
+    assert result is out
+    assert np.array_equal(out, cap.image)
+
+
+def test_save_screencap_async_writes_file(tmp_path) -> None:
+    cap = _DummyCap()
+    path = tmp_path / "async.png"
+
+    future = cap.save_screencap_async(str(path))
+
+    assert future.result(timeout=5) is True
+    saved = cv2.imread(str(path))
+    assert saved.shape == (2, 3, 3)
+    assert saved[0, 0].tolist() == [0, 0, 255]
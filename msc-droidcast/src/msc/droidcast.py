@@ -1,4 +1,5 @@
 import os.path
+import random
 import subprocess
 import time
 from typing import Optional
@@ -26,6 +27,8 @@ class DroidCast(ScreenCap):
     )
     APK_ANDROID_PATH = f"/data/local/tmp/{APK_NAME_PREFIX}{APK_VERSION}.apk"
     MAX_RETRY = 3
+    # Retry backoff doubles from RETRY_INITIAL_DELAY up to RETRY_DELAY
+    RETRY_INITIAL_DELAY = 0.01
     RETRY_DELAY = 0.5
 
     # Class-level cache for device installation status
@@ -38,6 +41,7 @@ class DroidCast(ScreenCap):
         display_id: Optional[int] = None,
         port: int = 53516,
         timeout: int = 3,
+        vm_size: Optional[tuple[int, int]] = None,
     ):
         """
         Initialize DroidCast screen capture.
@@ -48,6 +52,8 @@ class DroidCast(ScreenCap):
                 `adb shell dumpsys SurfaceFlinger --display-id` to get).
             port: DroidCast listen port on device.
             timeout: HTTP request timeout (seconds).
+            vm_size: screen (width, height). If None, it is queried from the
+                device, which costs one adb round trip.
         """
         self.adb = adb.device(serial)
         self.display_id: Optional[int] = display_id
@@ -65,14 +71,35 @@ class DroidCast(ScreenCap):
         self.url: Optional[str] = None
 
         # Expected buffer size based on current window size
-        self.width, self.height = self.adb.window_size()
+        if vm_size:
+            self.width, self.height = vm_size
+        else:
+            self.width, self.height = self.adb.window_size()
         self.buffer_size = self.width * self.height * 4
+        self._frame_shape = (self.height, self.width, 4)
         self.last_resize_check = 0.0
+        # Reusable receive buffer for screenshot bodies, plus a persistent
+        # (H, W, 4) array aliasing it so screencap() does not rebuild one
+        self._raw_buf = bytearray(self.buffer_size)
+        self._rebuild_rgba_view()
 
         # Install and start DroidCast process
         self.install()
         self.start()
 
+    @classmethod
+    def clear_device_cache(cls, serial: Optional[str] = None) -> None:
+        """
+        Forget cached installation status.
+
+        Args:
+            serial: device to forget. If None, the whole cache is cleared.
+        """
+        if serial is None:
+            cls._DEVICE_CACHE.clear()
+        else:
+            cls._DEVICE_CACHE.pop(serial, None)
+
     def install(self) -> None:
         """Ensure the expected DroidCast APK version is installed."""
         # Check cache first to avoid heavy ADB calls
@@ -218,62 +245,140 @@ class DroidCast(ScreenCap):
     def __del__(self) -> None:
         self.close()
 
-    def screencap_raw(self) -> bytes:
-        """Return raw RGBA bytes from DroidCast HTTP endpoint."""
-        if self.url is None:
-            self.forward_port()
+    def _rebuild_rgba_view(self) -> None:
+        """Re-create the RGBA array over the receive buffer after it or the resolution changes."""
+        if len(self._raw_buf) < self.buffer_size:
+            self._raw_buf = bytearray(self.buffer_size)
+        self._rgba_view = np.frombuffer(
+            self._raw_buf, np.uint8, count=self.buffer_size
+        ).reshape(self._frame_shape)
+
+    def _as_rgba_array(self, raw: memoryview) -> np.ndarray:
+        """View a screenshot body as an (H, W, 4) array; raise ValueError if it is short."""
+        if raw.obj is self._raw_buf and raw.nbytes >= self.buffer_size:
+            # Body landed in the receive buffer: reuse the persistent view
+            return self._rgba_view
+        return np.frombuffer(raw, np.uint8, count=self.buffer_size).reshape(
+            self._frame_shape
+        )
+
+    def _handle_resolution_change(self, raw_size: int) -> None:
+        """Re-query the device resolution after a short screenshot body."""
+        # Throttle window size checks to prevent ADB socket exhaustion
+        # Only check at most once per second
+        now = time.time()
+        if now - self.last_resize_check > 1.0:
+            self.last_resize_check = now
+            width, height = self.adb.window_size()
+            self.width, self.height = width, height
+            self.buffer_size = width * height * 4
+            self._frame_shape = (height, width, 4)
+            self._rebuild_rgba_view()
+
+        if raw_size < self.buffer_size:
+            raise ValueError(
+                f"Raw data length {raw_size} is less than expected {self.buffer_size}"
+            )
 
+    def _read_body(self, response: requests.Response) -> memoryview:
+        """Copy the response body into the reusable buffer and return a view of it."""
+        # Size the buffer from Content-Length up front when the server sends it
+        content_length = response.headers.get("Content-Length")
+        if content_length is not None and int(content_length) > len(self._raw_buf):
+            self._raw_buf = bytearray(int(content_length))
+            self._rebuild_rgba_view()
+
+        size = 0
+        view = memoryview(self._raw_buf)
+        for chunk in response.iter_content(chunk_size=len(self._raw_buf) or None):
+            end = size + len(chunk)
+            if end > len(self._raw_buf):
+                # Body larger than expected (e.g. resolution grew without a
+                # Content-Length header): move to a bigger buffer. A new
+                # bytearray is used because views handed out earlier pin the
+                # old one.
+                self._raw_buf = self._raw_buf[:size] + chunk
+                view = memoryview(self._raw_buf)
+                self._rebuild_rgba_view()
+            else:
+                view[size:end] = chunk
+            size = end
+        return view[:size]
+
+    def screencap_raw_view(self) -> memoryview:
+        """
+        Return raw RGBA data from the DroidCast HTTP endpoint as a view over
+        a reusable buffer. The view is valid until the next capture call.
+        """
+        # start() forwards the port during __init__ and nothing clears the URL
+        assert self.url is not None
         last_exc: Optional[Exception] = None
+        delay = self.RETRY_INITIAL_DELAY
 
         for attempt in range(1, self.MAX_RETRY + 1):
             try:
-                assert self.url is not None
-                response = self.session.get(self.url, timeout=self.timeout)
-                response.raise_for_status()
-                return response.content
+                # Close the streamed response on every path so its pooled
+                # connection is released even when the status or body read fails
+                with self.session.get(self.url, timeout=self.timeout, stream=True) as response:
+                    response.raise_for_status()
+                    return self._read_body(response)
             except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as exc:
                 last_exc = exc
                 logger.warning(
                     "DroidCast screenshot connection failed on attempt "
                     f"{attempt}/{self.MAX_RETRY}: {exc}"
                 )
-                self.restart()
-                time.sleep(self.RETRY_DELAY)
+                # A single failure is often a transient hiccup; only restart
+                # the server process once it keeps failing
+                if attempt >= 2:
+                    self.restart()
             except requests.exceptions.HTTPError as exc:
                 last_exc = exc
                 logger.warning(
                     "DroidCast screenshot HTTP error on attempt "
                     f"{attempt}/{self.MAX_RETRY}: {exc}"
                 )
-                time.sleep(self.RETRY_DELAY)
+
+            if attempt < self.MAX_RETRY:
+                # Exponential backoff with jitter
+                time.sleep(delay * random.uniform(0.5, 1.0))
+                delay = min(delay * 2, self.RETRY_DELAY)
 
         raise RuntimeError(
             f"Failed to get screenshot from DroidCast after {self.MAX_RETRY} attempts"
         ) from last_exc
 
-    def screencap(self) -> cv2.Mat:
-        """Return an OpenCV BGR image for the current screen."""
-        raw = self.screencap_raw()
-
-        # If the device resolution changed since init, try to adapt.
-        if len(raw) < self.buffer_size:
-            # Throttle window size checks to prevent ADB socket exhaustion
-            # Only check at most once per second
-            now = time.time()
-            if now - self.last_resize_check > 1.0:
-                self.last_resize_check = now
-                width, height = self.adb.window_size()
-                buffer_size = width * height * 4
-                self.width, self.height, self.buffer_size = width, height, buffer_size
-
-            if len(raw) < self.buffer_size:
-                raise ValueError(
-                    f"Raw data length {len(raw)} is less than expected {self.buffer_size}"
-                )
+    def screencap_raw(self) -> bytes:
+        """Return raw RGBA bytes from DroidCast HTTP endpoint."""
+        return bytes(self.screencap_raw_view())
 
-        arr = np.frombuffer(raw[: self.buffer_size], np.uint8).reshape(
-            (self.height, self.width, 4)
-        )
+    def _screencap_rgba(self) -> np.ndarray:
+        """Fetch a screenshot and view it as an (H, W, 4) RGBA array."""
+        raw = self.screencap_raw_view()
 
+        try:
+            return self._as_rgba_array(raw)
+        except ValueError:
+            # Short body: the device resolution probably changed since init
+            self._handle_resolution_change(len(raw))
+            return self._as_rgba_array(raw)
+
+    def screencap(self) -> cv2.Mat:
+        """Return an OpenCV BGR image for the current screen."""
         # Convert from RGBA to OpenCV BGR
-        return cv2.cvtColor(arr, cv2.COLOR_RGBA2BGR)
+        return cv2.cvtColor(self._screencap_rgba(), cv2.COLOR_RGBA2BGR)
+
+    def screencap_into(self, out: np.ndarray) -> np.ndarray:
+        """Convert the current screen straight into a caller-owned BGR buffer."""
+        rgba = self._screencap_rgba()
+        if out.shape != rgba.shape[:2] + (3,) or out.dtype != np.uint8:
+            raise ValueError(
+                f"Output buffer must be uint8 {rgba.shape[:2] + (3,)}, "
+                f"got {out.dtype} {out.shape}"
+            )
+        cv2.cvtColor(rgba, cv2.COLOR_RGBA2BGR, dst=out)
+        return out
+
+    def screencap_bgra(self) -> cv2.Mat:
+        """Return an OpenCV BGRA image for the current screen, keeping alpha."""
+        return cv2.cvtColor(self._screencap_rgba(), cv2.COLOR_RGBA2BGRA)
@@ -0,0 +1,8 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _no_retry_sleep(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> None:
+    """单元测试中跳过 DroidCast 的重试等待；e2e 测试保留真实延迟。"""
+    if request.node.get_closest_marker("e2e") is None:
+        monkeypatch.setattr("msc.droidcast.time.sleep", lambda _seconds: None)
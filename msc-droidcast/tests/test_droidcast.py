@@ -23,9 +23,11 @@ def test_droidcast_screencap_converts_rgba_to_bgr(monkeypatch: pytest.MonkeyPatc
     dc.width = width
     dc.height = height
     dc.buffer_size = width * height * 4
+    dc._frame_shape = (height, width, 4)
+    dc._raw_buf = bytearray()
 
-    # screencap_raw 应该返回 RGBA 缓冲
-    monkeypatch.setattr(DroidCast, "screencap_raw", lambda self: raw)
+    # screencap_raw_view 应该返回 RGBA 缓冲
+    monkeypatch.setattr(DroidCast, "screencap_raw_view", lambda self: memoryview(raw))
 
     mat = DroidCast.screencap(dc)
 
@@ -41,7 +43,7 @@ def test_droidcast_screencap_raw_retries_and_fails(monkeypatch: pytest.MonkeyPat
     dc.timeout = 0.1
 
     class FakeSession:
-        def get(self, url: str, timeout: float) -> Any:  # noqa: ARG002
+        def get(self, url: str, timeout: float, stream: bool = False) -> Any:  # noqa: ARG002
             raise requests.exceptions.ConnectionError("connection failed")
 
     restart_calls: list[float] = []
@@ -53,12 +55,252 @@ def test_droidcast_screencap_raw_retries_and_fails(monkeypatch: pytest.MonkeyPat
 
     # 减少测试时间
     monkeypatch.setattr(DroidCast, "MAX_RETRY", 2)
-    monkeypatch.setattr(DroidCast, "RETRY_DELAY", 0.0)
     monkeypatch.setattr(DroidCast, "restart", fake_restart, raising=False)
 
     with pytest.raises(RuntimeError) as exc:
         DroidCast.screencap_raw(dc)
 
     assert "Failed to get screenshot from DroidCast" in str(exc.value)
-    # 应该重试多次
-    assert len(restart_calls) == 2
+    # 首次失败不重启，之后每次失败重启
+    assert len(restart_calls) == 1
+
+
+def test_droidcast_screencap_raw_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    dc = DroidCast.__new__(DroidCast)  # type: ignore[call-arg]
+    dc.url = "http://127.0.0.1:12345"
+    dc.timeout = 0.1
+
+    class FakeSession:
+        def get(self, url: str, timeout: float, stream: bool = False) -> Any:  # noqa: ARG002
+            raise requests.exceptions.Timeout("timed out")
+
+    dc.session = FakeSession()
+
+    delays: list[float] = []
+    monkeypatch.setattr("msc.droidcast.time.sleep", delays.append)
+    monkeypatch.setattr(DroidCast, "MAX_RETRY", 4)
+    monkeypatch.setattr(DroidCast, "RETRY_DELAY", 0.02)
+    monkeypatch.setattr(DroidCast, "restart", lambda self: None, raising=False)
+
+    with pytest.raises(RuntimeError):
+        DroidCast.screencap_raw(dc)
+
+    # 指数退避且不超过 RETRY_DELAY，最后一次失败后不再等待
+    assert len(delays) == 3
+    assert 0.005 <= delays[0] <= 0.01
+    assert 0.01 <= delays[1] <= 0.02
+    assert 0.01 <= delays[2] <= 0.02
+
+
+class _FakeResponse:
+    def __init__(
+        self, body: bytes, chunk_size: int, content_length: bool = True, status_ok: bool = True
+    ) -> None:
+        self._body = body
+        self._chunk_size = chunk_size
+        self._status_ok = status_ok
+        self.headers = {"Content-Length": str(len(body))} if content_length else {}
+        self.closed = False
+
+    def __enter__(self) -> "_FakeResponse":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.closed = True
+
+    def raise_for_status(self) -> None:
+        if not self._status_ok:
+            raise requests.exceptions.HTTPError("500 Server Error")
+
+    def iter_content(self, chunk_size: Any = None) -> Any:  # noqa: ARG002
+        for i in range(0, len(self._body), self._chunk_size):
+            yield self._body[i : i + self._chunk_size]
+
+
+def test_droidcast_screencap_raw_closes_failed_responses(monkeypatch: pytest.MonkeyPatch) -> None:
+    dc = DroidCast.__new__(DroidCast)  # type: ignore[call-arg]
+    dc.url = "http://127.0.0.1:12345"
+    dc.timeout = 0.1
+
+    responses: list[_FakeResponse] = []
+
+    class FakeSession:
+        def get(self, url: str, timeout: float, stream: bool = False) -> Any:  # noqa: ARG002
+            response = _FakeResponse(b"", chunk_size=1, status_ok=False)
+            responses.append(response)
+            return response
+
+    dc.session = FakeSession()
+
+    with pytest.raises(RuntimeError):
+        DroidCast.screencap_raw(dc)
+
+    # 每次重试的失败响应都已关闭，连接归还连接池
+    assert len(responses) == DroidCast.MAX_RETRY
+    assert all(r.closed for r in responses)
+
+
+def test_droidcast_screencap_raw_reuses_buffer() -> None:
+    body = bytes(range(16))
+
+    dc = DroidCast.__new__(DroidCast)  # type: ignore[call-arg]
+    dc.url = "http://127.0.0.1:12345"
+    dc.timeout = 0.1
+    dc.buffer_size = 16
+    dc._frame_shape = (2, 2, 4)
+    dc._raw_buf = bytearray(16)
+    buf = dc._raw_buf
+
+    class FakeSession:
+        def get(self, url: str, timeout: float, stream: bool = False) -> Any:  # noqa: ARG002
+            assert stream is True
+            return _FakeResponse(body, chunk_size=5)
+
+    dc.session = FakeSession()
+
+    view = DroidCast.screencap_raw_view(dc)
+    assert view.tobytes() == body
+    # 数据写入预分配的缓冲区，而不是新建对象
+    assert dc._raw_buf is buf
+
+    raw = DroidCast.screencap_raw(dc)
+    assert isinstance(raw, bytes)
+    assert raw == body
+
+
+@pytest.mark.parametrize("content_length", [True, False])
+def test_droidcast_screencap_raw_grows_buffer(content_length: bool) -> None:
+    body = bytes(range(24))
+
+    dc = DroidCast.__new__(DroidCast)  # type: ignore[call-arg]
+    dc.url = "http://127.0.0.1:12345"
+    dc.timeout = 0.1
+    dc.buffer_size = 16
+    dc._frame_shape = (2, 2, 4)
+    dc._raw_buf = bytearray(16)
+
+    class FakeSession:
+        def get(self, url: str, timeout: float, stream: bool = False) -> Any:  # noqa: ARG002
+            return _FakeResponse(body, chunk_size=10, content_length=content_length)
+
+    dc.session = FakeSession()
+
+    assert DroidCast.screencap_raw(dc) == body
+    assert len(dc._raw_buf) == 24
+
+
+def test_droidcast_clear_device_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        DroidCast, "_DEVICE_CACHE", {"a": {DroidCast.APK_VERSION}, "b": set()}
+    )
+
+    DroidCast.clear_device_cache("a")
+    assert DroidCast._DEVICE_CACHE == {"b": set()}
+
+    DroidCast.clear_device_cache()
+    assert DroidCast._DEVICE_CACHE == {}
+
+
+def test_droidcast_screencap_uses_persistent_view(monkeypatch: pytest.MonkeyPatch) -> None:
+    width, height = 2, 1
+    pixels = np.array(
+        [[[10, 20, 30, 255], [40, 50, 60, 255]]],
+        dtype=np.uint8,
+    )
+
+    dc = DroidCast.__new__(DroidCast)  # type: ignore[call-arg]
+    dc.width = width
+    dc.height = height
+    dc.buffer_size = width * height * 4
+    dc._frame_shape = (height, width, 4)
+    dc._raw_buf = bytearray(dc.buffer_size)
+    dc._rebuild_rgba_view()
+    rgba_view = dc._rgba_view
+
+    def fake_raw_view(self) -> memoryview:
+        self._raw_buf[:] = pixels.tobytes()
+        return memoryview(self._raw_buf)
+
+    monkeypatch.setattr(DroidCast, "screencap_raw_view", fake_raw_view)
+
+    mat = DroidCast.screencap(dc)
+
+    assert dc._rgba_view is rgba_view
+    assert mat[0, 0].tolist() == [30, 20, 10]
+    assert mat[0, 1].tolist() == [60, 50, 40]
+
+
+def test_droidcast_screencap_handles_resolution_change(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pixels = np.array([[[10, 20, 30, 255]]], dtype=np.uint8)
+
+    dc = DroidCast.__new__(DroidCast)  # type: ignore[call-arg]
+    dc.width = 2
+    dc.height = 1
+    dc.buffer_size = 8
+    dc._frame_shape = (1, 2, 4)
+    dc._raw_buf = bytearray()
+    dc.last_resize_check = 0.0
+
+    class FakeAdb:
+        def window_size(self) -> tuple[int, int]:
+            return 1, 1
+
+    dc.adb = FakeAdb()
+
+    monkeypatch.setattr(
+        DroidCast, "screencap_raw_view", lambda self: memoryview(pixels.tobytes())
+    )
+
+    mat = DroidCast.screencap(dc)
+
+    assert (dc.width, dc.height, dc.buffer_size) == (1, 1, 4)
+    assert mat.shape == (1, 1, 3)
+    assert mat[0, 0].tolist() == [30, 20, 10]
+
+
+def test_droidcast_screencap_bgra(monkeypatch: pytest.MonkeyPatch) -> None:
+    pixels = np.array(
+        [[[10, 20, 30, 200], [40, 50, 60, 255]]],
+        dtype=np.uint8,
+    )
+
+    dc = DroidCast.__new__(DroidCast)  # type: ignore[call-arg]
+    dc.buffer_size = pixels.nbytes
+    dc._frame_shape = pixels.shape
+    dc._raw_buf = bytearray()
+
+    monkeypatch.setattr(
+        DroidCast, "screencap_raw_view", lambda self: memoryview(pixels.tobytes())
+    )
+
+    mat = DroidCast.screencap_bgra(dc)
+
+    assert mat.shape == (1, 2, 4)
+    assert mat[0, 0].tolist() == [30, 20, 10, 200]
+    assert mat[0, 1].tolist() == [60, 50, 40, 255]
+
+
+def test_droidcast_screencap_into(monkeypatch: pytest.MonkeyPatch) -> None:
+    pixels = np.array(
+        [[[10, 20, 30, 255], [40, 50, 60, 255]]],
+        dtype=np.uint8,
+    )
+
+    dc = DroidCast.__new__(DroidCast)  # type: ignore[call-arg]
+    dc.buffer_size = pixels.nbytes
+    dc._frame_shape = pixels.shape
+    dc._raw_buf = bytearray()
+
+    monkeypatch.setattr(
+        DroidCast, "screencap_raw_view", lambda self: memoryview(pixels.tobytes())
+    )
+
+    out = np.empty((1, 2, 3), dtype=np.uint8)
+    assert DroidCast.screencap_into(dc, out) is out
+    assert out[0, 0].tolist() == [30, 20, 10]
+    assert out[0, 1].tolist() == [60, 50, 40]
+
+    with pytest.raises(ValueError):
+        DroidCast.screencap_into(dc, np.empty((2, 2, 3), dtype=np.uint8))
@@ -1,6 +1,8 @@
+import errno
 import json
 import os.path
 import socket
+import struct
 import subprocess
 import threading
 import time
@@ -14,129 +16,189 @@ from loguru import logger
 from msc.screencap import ScreenCap
 
 
+# minicap banner：version, length, pid, realWidth, realHeight,
+# virtualWidth, virtualHeight, orientation, quirks（小端）
+_BANNER_STRUCT = struct.Struct("<BBIIIIIBB")
+
+
+def _parse_banner(data: bytes) -> dict[str, int]:
+    """解析 minicap banner"""
+    (
+        version,
+        length,
+        pid,
+        real_width,
+        real_height,
+        virtual_width,
+        virtual_height,
+        orientation,
+        quirks,
+    ) = _BANNER_STRUCT.unpack_from(data)
+    return {
+        "version": version,
+        "length": length,
+        "pid": pid,
+        "realWidth": real_width,
+        "realHeight": real_height,
+        "virtualWidth": virtual_width,
+        "virtualHeight": virtual_height,
+        "orientation": orientation * 90,
+        "quirks": quirks,
+    }
+
+
+# socket 被关闭时 recv 可能抛出的 errno（含 Windows 的 WSAECONNABORTED / WSAECONNRESET）
+_CLOSED_ERRNOS = frozenset(
+    {10053, 10054, errno.ECONNABORTED, errno.ECONNRESET, errno.EBADF}
+)
+
+
 class MiniCapStream:
-    def __init__(self, host: str, port: int) -> None:
+    # 接收缓冲区大小，需容纳多块整帧 RGBA 数据以免 TCP 窗口限制吞吐
+    RCVBUF_SIZE = 4 * 1024 * 1024
+
+    def __init__(self, host: str, port: int, use_thread: bool = True) -> None:
         self.host = host
         self.port = port
+        # 为 False 时不启动读取线程，由 next_image_view 在调用方线程中接收数据
+        self.use_thread = use_thread
         self.sock: Optional[socket.socket] = None
-        self.data: Optional[bytes] = None
+        # banner 解析状态：先读取前 2 字节，得到 banner 实际长度后再补齐
+        self.banner: Optional[dict[str, int]] = None
+        self._banner_buf = bytearray()
+        self._banner_length = 2
+        # 每帧固定为 virtualWidth * virtualHeight * 4 字节的 RGBA 数据，banner 解析后确定
+        self._frame_length: Optional[int] = None
+        # banner 阶段的暂存缓冲；进入帧阶段后直接 recv_into 帧缓冲区
+        self._staging = memoryview(bytearray(65536))
+        # 三重缓冲：生产者写入的 _write_buf、最新完整帧 _ready_buf、消费者持有的 _read_buf。
+        # 完成一帧或取帧时只在锁内交换引用，不复制整帧数据
+        self._write_buf = memoryview(bytearray())
+        self._write_pos = 0
+        self._ready_buf: Optional[memoryview] = None
+        self._read_buf: Optional[memoryview] = None
+        self._fresh = False  # _ready_buf 中是否有消费者尚未取走的新帧
+        # 消费者取走之前就被新帧覆盖的帧数，可据此调整 minicap 帧率（-r）
+        self.dropped_frames = 0
+        # 交换缓冲引用用的轻量锁；data_available 在第一帧就绪后保持置位
+        self._swap_lock = threading.Lock()
         self.stop_event = threading.Event()
         self.thread = threading.Thread(target=self.read_stream, daemon=True)
-        self.data_available = threading.Condition()
+        self.data_available = threading.Event()
 
     def start(self) -> None:
         try:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            # 在 connect 前设置，才能参与 TCP 窗口协商
+            try:
+                self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.RCVBUF_SIZE)
+            except OSError as e:
+                logger.warning(f"Failed to set SO_RCVBUF: {e}")
             self.sock.connect((self.host, self.port))
         except ConnectionRefusedError:
             logger.error(
                 f"Be sure to run `adb forward tcp:{self.port} localabstract:minicap`"
             )
             return
-        self.thread.start()
+        if self.use_thread:
+            self.thread.start()
 
     def read_stream(self) -> None:
-        banner = {
-            "version": 0,
-            "length": 0,
-            "pid": 0,
-            "realWidth": 0,
-            "realHeight": 0,
-            "virtualWidth": 0,
-            "virtualHeight": 0,
-            "orientation": 0,
-            "quirks": 0,
-        }
-
-        read_banner_bytes = 0
-        banner_length = 2
-        frame_body = bytearray()
-        # 每帧固定为 virtualWidth * virtualHeight * 4 字节的 RGBA 数据
-        frame_body_length: Optional[int] = None
-        max_buf_size = 4096
-
         try:
             while not self.stop_event.is_set():
-                try:
-                    assert self.sock is not None
-                    chunk = self.sock.recv(max_buf_size)
-                    if not chunk:
-                        # socket 已关闭
-                        break
-                except OSError as e:
-                    # Windows 下主动关闭 socket 会触发 WinError 10053/10054
-                    if e.errno in (10053, 10054) or "WinError 10053" in str(e):
-                        logger.info("Socket closed, stopping read_stream gracefully")
-                        break
-                    raise
-
-                cursor = 0
-                while cursor < len(chunk):
-                    if read_banner_bytes < banner_length:
-                        # 解析 banner（参考 minicap 协议）
-                        byte = chunk[cursor]
-                        if read_banner_bytes == 0:
-                            banner["version"] = byte
-                        elif read_banner_bytes == 1:
-                            banner["length"] = banner_length = byte
-                        elif 2 <= read_banner_bytes <= 5:
-                            banner["pid"] += (
-                                byte << ((read_banner_bytes - 2) * 8)
-                            ) & 0xFFFFFFFF
-                        elif 6 <= read_banner_bytes <= 9:
-                            banner["realWidth"] += (
-                                byte << ((read_banner_bytes - 6) * 8)
-                            ) & 0xFFFFFFFF
-                        elif 10 <= read_banner_bytes <= 13:
-                            banner["realHeight"] += (
-                                byte << ((read_banner_bytes - 10) * 8)
-                            ) & 0xFFFFFFFF
-                        elif 14 <= read_banner_bytes <= 17:
-                            banner["virtualWidth"] += (
-                                byte << ((read_banner_bytes - 14) * 8)
-                            ) & 0xFFFFFFFF
-                        elif 18 <= read_banner_bytes <= 21:
-                            banner["virtualHeight"] += (
-                                byte << ((read_banner_bytes - 18) * 8)
-                            ) & 0xFFFFFFFF
-                        elif read_banner_bytes == 22:
-                            banner["orientation"] = byte * 90
-                        elif read_banner_bytes == 23:
-                            banner["quirks"] = byte
-
-                        cursor += 1
-                        read_banner_bytes += 1
-
-                        if read_banner_bytes == banner_length:
-                            logger.info(f"banner {banner}")
-                    else:
-                        # banner 解析完成后开始按固定长度读取 RGBA 帧
-                        if frame_body_length is None:
-                            vw = banner["virtualWidth"]
-                            vh = banner["virtualHeight"]
-                            if vw and vh:
-                                frame_body_length = vw * vh * 4
-                            else:
-                                # 未能获取到有效分辨率，跳过本次数据
-                                break
-
-                        remaining = len(chunk) - cursor
-                        needed = frame_body_length - len(frame_body)
-                        to_read = min(remaining, needed)
-                        if to_read > 0:
-                            frame_body.extend(chunk[cursor : cursor + to_read])
-                            cursor += to_read
-
-                        if frame_body_length is not None and len(frame_body) == frame_body_length:
-                            # 完整帧就绪，通知等待者
-                            with self.data_available:
-                                self.data = bytes(frame_body)
-                                self.data_available.notify_all()
-                            # 重置缓冲，准备下一帧
-                            frame_body = bytearray()
+                if not self._recv_once():
+                    break
+        except ValueError as e:
+            logger.error(e)
         finally:
             logger.info("read_stream thread exiting")
 
+    def _recv_once(self) -> bool:
+        """接收一次数据并推进解析状态，socket 关闭时返回 False"""
+        in_frame = self._frame_length is not None
+        try:
+            assert self.sock is not None
+            if in_frame:
+                size = self.sock.recv_into(self._write_buf[self._write_pos :])
+            else:
+                size = self.sock.recv_into(self._staging)
+            if not size:
+                # socket 已关闭
+                return False
+        except OSError as e:
+            # 主动关闭 socket 会触发 WinError 10053/10054 或 EBADF 等
+            if e.errno in _CLOSED_ERRNOS:
+                logger.info("Socket closed, stopping read_stream gracefully")
+                return False
+            raise
+
+        if in_frame:
+            self._advance_frame(size)
+            return True
+
+        # banner 之后的数据可能已经属于第一帧
+        mv = self._staging[:size]
+        pos = 0
+        while pos < size:
+            if self._frame_length is None:
+                pos += self._consume_banner(mv[pos:])
+            else:
+                pos += self._consume_frame(mv[pos:])
+        return True
+
+    def _consume_banner(self, mv: memoryview) -> int:
+        """解析 banner（参考 minicap 协议），返回消耗的字节数"""
+        to_read = min(len(mv), self._banner_length - len(self._banner_buf))
+        self._banner_buf += mv[:to_read]
+        if len(self._banner_buf) == 2:
+            self._banner_length = max(self._banner_buf[1], _BANNER_STRUCT.size)
+        if len(self._banner_buf) < self._banner_length:
+            return to_read
+
+        self.banner = _parse_banner(self._banner_buf)
+        logger.info(f"banner {self.banner}")
+        vw = self.banner["virtualWidth"]
+        vh = self.banner["virtualHeight"]
+        if not (vw and vh):
+            raise ValueError("minicap banner has no valid virtual size")
+
+        frame_length = vw * vh * 4
+        self._write_buf = memoryview(bytearray(frame_length))
+        with self._swap_lock:
+            self._ready_buf = memoryview(bytearray(frame_length))
+            self._read_buf = memoryview(bytearray(frame_length))
+        self._frame_length = frame_length
+        return to_read
+
+    def _consume_frame(self, mv: memoryview) -> int:
+        """将已接收的数据复制进帧缓冲区，返回消耗的字节数"""
+        assert self._frame_length is not None
+        pos = self._write_pos
+        to_read = min(len(mv), self._frame_length - pos)
+        self._write_buf[pos : pos + to_read] = mv[:to_read]
+        self._advance_frame(to_read)
+        return to_read
+
+    def _advance_frame(self, size: int) -> None:
+        """帧缓冲区写入 size 字节后推进写入位置，帧完整时发布"""
+        self._write_pos += size
+        if self._write_pos == self._frame_length:
+            # 完整帧就绪：与就绪缓冲交换，首帧时唤醒等待者
+            with self._swap_lock:
+                self._write_buf, self._ready_buf = self._ready_buf, self._write_buf
+                dropped = self._fresh
+                self._fresh = True
+            if dropped:
+                self.dropped_frames += 1
+                if self.dropped_frames % 100 == 1:
+                    logger.debug(
+                        f"minicap dropped {self.dropped_frames} unread frames, "
+                        "consider lowering the capture rate"
+                    )
+            if not self.data_available.is_set():
+                self.data_available.set()
+            self._write_pos = 0
+
     def stop(self) -> None:
         logger.info("Stopping the stream")
         self.stop_event.set()
@@ -153,11 +215,29 @@ class MiniCapStream:
         if self.thread.is_alive():
             self.thread.join()
 
+    def next_image_view(self) -> memoryview:
+        """
+        获取最新一帧的只读视图。
+
+        视图指向消费者独占的读取缓冲，在下一次 next_image_view / next_image 调用前有效。
+        使用读取线程时，没有新帧则返回上一帧；不使用时阻塞接收下一帧。
+        """
+        if self.use_thread:
+            self.data_available.wait()  # 等待第一帧可用
+        else:
+            # 没有读取线程，在调用方线程中接收直到下一帧完整
+            while not self._fresh:
+                if not self._recv_once():
+                    raise RuntimeError("minicap stream closed")
+        with self._swap_lock:
+            if self._fresh:
+                self._read_buf, self._ready_buf = self._ready_buf, self._read_buf
+                self._fresh = False
+            assert self._read_buf is not None
+            return self._read_buf.toreadonly()
+
     def next_image(self) -> bytes:
-        with self.data_available:
-            while self.data is None or len(self.data) == 0:
-                self.data_available.wait()  # 等待数据可用
-            return self.data
+        return self.next_image_view().tobytes()
 
 
 class MiniCapUnSupportError(Exception):
@@ -179,6 +259,9 @@ class MiniCap(ScreenCap):
     # Class-level cache for device installation status
     # Key: serial, Value: bool (True if installed)
     _DEVICE_CACHE = {}
+    # Class-level cache for device properties
+    # Key: serial, Value: (ro.product.cpu.abi, ro.build.version.sdk)
+    _DEVICE_PROPS_CACHE: dict[str, tuple[str, str]] = {}
 
     def __init__(
         self,
@@ -188,6 +271,7 @@ class MiniCap(ScreenCap):
         skip_frame: bool = True,
         use_stream: bool = True,
         vm_size: Optional[tuple[int, int]] = None,
+        use_thread: bool = True,
     ) -> None:
         """
         __init__ minicap截图方式
@@ -199,19 +283,21 @@ class MiniCap(ScreenCap):
             skip_frame(bool,optional): 当无法快速获得截图时，跳过这个帧
             use_stream (bool, optional): 是否使用stream的方式. Defaults to True.
             vm_size (tuple[int, int], optional): 屏幕宽,高. Defaults to None (从设备获取).
+            use_thread (bool, optional): stream 模式下是否使用后台线程持续接收帧.
+                为 False 时在截图调用中按需接收. Defaults to True.
         """
         # 初始化设备
         self.adb = adb.device(serial)
         self.skip_frame = skip_frame
         self.use_stream = use_stream
+        self.use_thread = use_thread
         self.quality = quality
         self.rate = rate
         # 初始化设备信息
         self.rotation: Optional[int] = None
         self.vm_size: Optional[str] = None
         self.port: Optional[int] = None
-        self.abi = self.adb.getprop("ro.product.cpu.abi")
-        self.sdk = self.adb.getprop("ro.build.version.sdk")
+        self.abi, self.sdk = self.get_device_props()
 
         # 记录当前窗口大小，并计算 RGBA 缓冲区长度
         if vm_size:
@@ -229,6 +315,20 @@ class MiniCap(ScreenCap):
         if self.use_stream:
             self.start_minicap_by_stream()
 
+    def get_device_props(self) -> tuple[str, str]:
+        """一次 shell 调用读取 abi 与 sdk，并按设备缓存"""
+        serial = self.adb.serial
+        if serial not in self._DEVICE_PROPS_CACHE:
+            output = self.adb.shell("getprop ro.product.cpu.abi; getprop ro.build.version.sdk")
+            lines = [line.strip() for line in output.splitlines()]
+            if len(lines) == 2 and all(lines):
+                abi, sdk = lines
+            else:
+                abi = self.adb.getprop("ro.product.cpu.abi")
+                sdk = self.adb.getprop("ro.build.version.sdk")
+            self._DEVICE_PROPS_CACHE[serial] = (abi, sdk)
+        return self._DEVICE_PROPS_CACHE[serial]
+
     def kill(self) -> None:
         self.adb.shell(["pkill", "-9", "minicap"])
 
@@ -303,8 +403,6 @@ class MiniCap(ScreenCap):
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
         )
-        logger.info("minicap connection takes a long time, please be patient.")
-        time.sleep(self.MINICAP_START_TIMEOUT)
 
     def forward_port(self) -> None:
         # Try a range of fixed ports to avoid WSL/Windows port binding conflicts
@@ -331,15 +429,36 @@ class MiniCap(ScreenCap):
                 logger.error(f"Failed to forward port: {e}")
                 raise
 
+    def wait_for_minicap(self) -> None:
+        """轮询转发端口，直到 minicap 发出 banner；最多等待 MINICAP_START_TIMEOUT 秒"""
+        assert self.port is not None
+        logger.info("Waiting for minicap to accept connections")
+        deadline = time.monotonic() + self.MINICAP_START_TIMEOUT
+        while True:
+            try:
+                # adb forward 在 minicap 未监听时也会接受连接随后关闭，因此以能读到数据为准
+                with socket.create_connection(("127.0.0.1", self.port), timeout=0.5) as sock:
+                    if sock.recv(1, socket.MSG_PEEK):
+                        return
+            except OSError:
+                pass
+            if time.monotonic() >= deadline:
+                logger.warning(
+                    f"minicap did not answer within {self.MINICAP_START_TIMEOUT}s, continuing"
+                )
+                return
+            time.sleep(0.05)
+
     def read_minicap_stream(self) -> None:
         # 会通过 adb 转发到本地端口，所以地址写死 127.0.0.1，端口号为转发得到的端口
         assert self.port is not None
-        self.stream = MiniCapStream("127.0.0.1", self.port)
+        self.stream = MiniCapStream("127.0.0.1", self.port, use_thread=self.use_thread)
         self.stream.start()
 
     def start_minicap_by_stream(self) -> None:
         self.start_minicap()
         self.forward_port()
+        self.wait_for_minicap()
         self.read_minicap_stream()
 
     def stop_minicap_by_stream(self) -> None:
@@ -369,32 +488,83 @@ class MiniCap(ScreenCap):
         raw_data = self.adb.shell(adb_command, encoding=None)
         return raw_data.split(b"for JPG encoder\n")[-1]
 
+    def screencap_raw_view(self) -> memoryview:
+        """stream 模式下返回读取缓冲的视图，在下一次截图调用前有效"""
+        if self.use_stream:
+            assert self.stream is not None
+            return self.stream.next_image_view()
+        return memoryview(self.get_minicap_frame())
+
     def screencap_raw(self) -> bytes:
         if self.use_stream:
             assert self.stream is not None
             return self.stream.next_image()
         return self.get_minicap_frame()
 
-    def screencap(self) -> cv2.Mat:
-        raw = self.screencap_raw()
+    def _fetch_raw_view(self) -> memoryview:
+        raw = self.screencap_raw_view()
         if not raw:
             raise ValueError("Empty frame received from minicap")
+        return raw
 
-        if self.use_stream:
-            # 原始 RGBA 数据
-            if len(raw) < self.buffer_size:
-                raise ValueError(
-                    f"Raw data length {len(raw)} is less than expected {self.buffer_size}"
-                )
-            arr = np.frombuffer(raw[: self.buffer_size], np.uint8).reshape(
-                (self.height, self.width, 4)
+    def _as_rgba_array(self, raw: memoryview) -> np.ndarray:
+        """stream 模式下将原始 RGBA 数据视为 (H, W, 4) 数组，不切片复制"""
+        if len(raw) < self.buffer_size:
+            raise ValueError(
+                f"Raw data length {len(raw)} is less than expected {self.buffer_size}"
             )
-            return cv2.cvtColor(arr, cv2.COLOR_RGBA2BGR)
+        return np.frombuffer(raw, np.uint8, count=self.buffer_size).reshape(
+            (self.height, self.width, 4)
+        )
 
-        # 非 stream 模式下，minicap 输出 JPEG
-        arr = np.frombuffer(raw, np.uint8)
-        image = cv2.imdecode(arr, cv2.IMREAD_COLOR)
+    @staticmethod
+    def _decode_jpeg(raw: memoryview) -> np.ndarray:
+        """非 stream 模式下，minicap 输出 JPEG"""
+        image = cv2.imdecode(np.frombuffer(raw, np.uint8), cv2.IMREAD_COLOR)
         if image is None:
             raise ValueError("Failed to decode JPEG frame from minicap")
         return image
 
+    def screencap(self) -> cv2.Mat:
+        raw = self._fetch_raw_view()
+        if self.use_stream:
+            return cv2.cvtColor(self._as_rgba_array(raw), cv2.COLOR_RGBA2BGR)
+        return self._decode_jpeg(raw)
+
+    def screencap_into(self, out: np.ndarray) -> np.ndarray:
+        """stream 模式下直接将 RGBA 转换写入调用方提供的 BGR 缓冲区"""
+        if not self.use_stream:
+            return super().screencap_into(out)
+
+        shape = (self.height, self.width, 3)
+        if out.shape != shape or out.dtype != np.uint8:
+            raise ValueError(f"Output buffer must be uint8 {shape}, got {out.dtype} {out.shape}")
+        cv2.cvtColor(self._as_rgba_array(self._fetch_raw_view()), cv2.COLOR_RGBA2BGR, dst=out)
+        return out
+
+    def screencap_rgb_view(self) -> np.ndarray:
+        """
+        获取 RGB 通道顺序的截图视图，不做颜色转换。
+
+        stream 模式下为 RGBA 数据上去掉 alpha 的非连续切片，只读且在下一次截图调用前有效；
+        不能直接传给要求连续内存或 BGR 顺序的 OpenCV 函数（如 imshow / imwrite），
+        适合 mean 等只依赖像素值的 NumPy 运算。
+        """
+        raw = self._fetch_raw_view()
+        if self.use_stream:
+            return self._as_rgba_array(raw)[..., :3]
+        return self._decode_jpeg(raw)[..., ::-1]
+
+    def screencap_rgb(self) -> np.ndarray:
+        """获取连续内存的 RGB 格式截图"""
+        raw = self._fetch_raw_view()
+        if self.use_stream:
+            return cv2.cvtColor(self._as_rgba_array(raw), cv2.COLOR_RGBA2RGB)
+        return cv2.cvtColor(self._decode_jpeg(raw), cv2.COLOR_BGR2RGB)
+
+    def screencap_bgra(self) -> cv2.Mat:
+        """获取保留 alpha 通道的 BGRA 格式截图"""
+        raw = self._fetch_raw_view()
+        if self.use_stream:
+            return cv2.cvtColor(self._as_rgba_array(raw), cv2.COLOR_RGBA2BGRA)
+        return cv2.cvtColor(self._decode_jpeg(raw), cv2.COLOR_BGR2BGRA)
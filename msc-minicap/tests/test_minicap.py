@@ -1,9 +1,10 @@
+import socket
 from types import SimpleNamespace
 
 import numpy as np
 import pytest
 
-from msc.minicap import MiniCap, MiniCapStream
+from msc.minicap import MiniCap, MiniCapStream, _parse_banner
 
 pytestmark = pytest.mark.unit
 
@@ -21,6 +22,15 @@ class _FakeSocket:
             return self._chunks.pop(0)
         return b""
 
+    def recv_into(self, buffer: memoryview) -> int:
+        chunk = self.recv(len(buffer))
+        if len(chunk) > len(buffer):
+            # 放不下的部分留给下一次读取
+            self._chunks.insert(0, chunk[len(buffer) :])
+            chunk = chunk[: len(buffer)]
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
 
 def _make_minicap_stream_chunk(width: int, height: int) -> bytes:
     # Build a minimal banner with virtualWidth/virtualHeight set.
@@ -60,8 +70,164 @@ def test_minicap_stream_reads_single_frame(monkeypatch: pytest.MonkeyPatch) -> N
     # Run in current thread; no need to call start()
     stream.read_stream()
 
-    assert stream.data is not None
-    assert len(stream.data) == width * height * 4
+    assert len(stream.next_image()) == width * height * 4
+
+
+def test_minicap_parse_banner() -> None:
+    banner = _parse_banner(_make_minicap_stream_chunk(1920, 1080)[:24])
+
+    assert banner["version"] == 1
+    assert banner["length"] == 24
+    assert banner["virtualWidth"] == 1920
+    assert banner["virtualHeight"] == 1080
+
+
+def test_minicap_stream_exits_when_socket_closed() -> None:
+    class _ClosedSocket(_FakeSocket):
+        def recv_into(self, buffer: memoryview) -> int:  # noqa: ARG002
+            raise OSError(9, "Bad file descriptor")
+
+    stream = MiniCapStream("127.0.0.1", 12345)
+    stream.sock = _ClosedSocket([])  # type: ignore[assignment]
+
+    # 不应抛出异常
+    stream.read_stream()
+
+
+def test_minicap_stream_reads_split_banner() -> None:
+    width, height = 2, 1
+    chunk = _make_minicap_stream_chunk(width, height)
+
+    # banner 与帧数据被拆分到多个 recv 中
+    fake_socket = _FakeSocket([chunk[:1], chunk[1:10], chunk[10:30], chunk[30:], b""])
+
+    stream = MiniCapStream("127.0.0.1", 12345)
+    stream.sock = fake_socket  # type: ignore[assignment]
+    stream.read_stream()
+
+    assert stream.next_image() == chunk[24:]
+
+
+def test_minicap_stream_stops_on_invalid_banner() -> None:
+    chunk = _make_minicap_stream_chunk(0, 0) + b"\x00" * 8
+
+    stream = MiniCapStream("127.0.0.1", 12345)
+    stream.sock = _FakeSocket([chunk, b"never read"])  # type: ignore[assignment]
+    stream.read_stream()
+
+    assert stream.banner is not None
+    assert stream.banner["virtualWidth"] == 0
+    assert stream._frame_length is None  # noqa: SLF001
+
+
+def test_minicap_stream_reads_consecutive_frames() -> None:
+    width, height = 2, 1
+    chunk = _make_minicap_stream_chunk(width, height)
+    second = bytes([1, 2, 3, 4, 5, 6, 7, 8])
+
+    # 第一帧结尾与第二帧开头位于同一个 recv 中
+    fake_socket = _FakeSocket([chunk[:30], chunk[30:] + second[:3], second[3:], b""])
+
+    stream = MiniCapStream("127.0.0.1", 12345)
+    stream.sock = fake_socket  # type: ignore[assignment]
+    stream.read_stream()
+
+    assert stream.next_image() == second
+
+
+def test_minicap_stream_without_thread_reads_on_demand() -> None:
+    width, height = 2, 1
+    chunk = _make_minicap_stream_chunk(width, height)
+    second = bytes(range(8))
+
+    stream = MiniCapStream("127.0.0.1", 12345, use_thread=False)
+    stream.sock = _FakeSocket([chunk[:10], chunk[10:], second[:5], second[5:], b""])  # type: ignore[assignment]
+
+    assert stream.next_image() == chunk[24:]
+    assert stream.next_image() == second
+    with pytest.raises(RuntimeError):
+        stream.next_image()
+
+
+def test_minicap_stream_view_survives_new_frames() -> None:
+    width, height = 2, 1
+    chunk = _make_minicap_stream_chunk(width, height)
+    second = bytes(range(8))
+    third = bytes(range(8, 16))
+
+    stream = MiniCapStream("127.0.0.1", 12345)
+    views: list[memoryview] = []
+
+    class _GrabbingSocket(_FakeSocket):
+        def recv_into(self, buffer: memoryview) -> int:
+            # 第一帧就绪后由消费者取走视图，之后生产者继续写入新帧
+            if stream._fresh and not views:  # noqa: SLF001
+                views.append(stream.next_image_view())
+            return super().recv_into(buffer)
+
+    stream.sock = _GrabbingSocket([chunk, second, third, b""])  # type: ignore[assignment]
+    stream.read_stream()
+
+    assert views[0].readonly
+    # 第二帧未被读取就被第三帧覆盖
+    assert stream.dropped_frames == 1
+    assert bytes(views[0]) == chunk[24:]
+    assert stream.next_image() == third
+    # 没有新帧时返回同一帧
+    assert stream.next_image() == third
+
+
+def test_minicap_stream_start_sets_rcvbuf(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[tuple] = []
+
+    class _OptSocket(_FakeSocket):
+        def setsockopt(self, *args) -> None:
+            calls.append(args)
+
+    monkeypatch.setattr(
+        "msc.minicap.socket.socket", lambda *args: _OptSocket([b""])  # noqa: ARG005
+    )
+
+    stream = MiniCapStream("127.0.0.1", 12345)
+    stream.start()
+    stream.thread.join(timeout=1)
+
+    assert (socket.SOL_SOCKET, socket.SO_RCVBUF, MiniCapStream.RCVBUF_SIZE) in calls
+
+
+def test_minicap_wait_for_minicap_polls_until_banner(monkeypatch: pytest.MonkeyPatch) -> None:
+    # 第一次连接被拒绝，第二次 adb 接受后立即关闭，第三次读到 banner
+    responses: list = [ConnectionRefusedError(), b"", b"\x01"]
+    sleeps: list[float] = []
+
+    class _ProbeSocket:
+        def __init__(self, data: bytes) -> None:
+            self._data = data
+
+        def __enter__(self) -> "_ProbeSocket":
+            return self
+
+        def __exit__(self, *exc) -> None:
+            return None
+
+        def recv(self, bufsize: int, flags: int = 0) -> bytes:  # noqa: ARG002
+            return self._data
+
+    def fake_create_connection(address, timeout=None):  # noqa: ARG001
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return _ProbeSocket(response)
+
+    monkeypatch.setattr("msc.minicap.socket.create_connection", fake_create_connection)
+    monkeypatch.setattr("msc.minicap.time.sleep", sleeps.append)
+
+    cap = MiniCap.__new__(MiniCap)  # type: ignore[call-arg]
+    cap.port = 12345
+    MiniCap.wait_for_minicap(cap)
+
+    assert responses == []
+    assert len(sleeps) == 2
 
 
 def test_minicap_screencap_stream_rgba_to_bgr(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -78,8 +244,8 @@ def test_minicap_screencap_stream_rgba_to_bgr(monkeypatch: pytest.MonkeyPatch) -
     cap.buffer_size = width * height * 4
     cap.use_stream = True
 
-    # Ensure screencap_raw returns our fake buffer
-    monkeypatch.setattr(MiniCap, "screencap_raw", lambda self: raw_bytes)
+    # Ensure screencap_raw_view returns our fake buffer
+    monkeypatch.setattr(MiniCap, "screencap_raw_view", lambda self: memoryview(raw_bytes))
 
     mat = MiniCap.screencap(cap)
     assert mat.shape == (height, width, 3)
@@ -88,3 +254,100 @@ def test_minicap_screencap_stream_rgba_to_bgr(monkeypatch: pytest.MonkeyPatch) -
     assert mat[0, 0].tolist() == [30, 20, 10]
     assert mat[0, 1].tolist() == [60, 50, 40]
 
+
+def test_minicap_screencap_raw_view_uses_stream_buffer() -> None:
+    width, height = 2, 1
+    chunk = _make_minicap_stream_chunk(width, height)
+
+    stream = MiniCapStream("127.0.0.1", 12345)
+    stream.sock = _FakeSocket([chunk, b""])  # type: ignore[assignment]
+    stream.read_stream()
+
+    cap = MiniCap.__new__(MiniCap)  # type: ignore[call-arg]
+    cap.use_stream = True
+    cap.stream = stream
+
+    view = MiniCap.screencap_raw_view(cap)
+    assert isinstance(view, memoryview)
+    assert bytes(view) == chunk[24:]
+    assert MiniCap.screencap_raw(cap) == chunk[24:]
+
+
+def test_minicap_screencap_bgra(monkeypatch: pytest.MonkeyPatch) -> None:
+    pixels = np.array([[[10, 20, 30, 200], [40, 50, 60, 255]]], dtype=np.uint8)
+
+    cap = MiniCap.__new__(MiniCap)  # type: ignore[call-arg]
+    cap.width = 2
+    cap.height = 1
+    cap.buffer_size = pixels.nbytes
+    cap.use_stream = True
+
+    monkeypatch.setattr(
+        MiniCap, "screencap_raw_view", lambda self: memoryview(pixels.tobytes())
+    )
+
+    mat = MiniCap.screencap_bgra(cap)
+    assert mat.shape == (1, 2, 4)
+    assert mat[0, 0].tolist() == [30, 20, 10, 200]
+    assert mat[0, 1].tolist() == [60, 50, 40, 255]
+
+
+def test_minicap_screencap_into(monkeypatch: pytest.MonkeyPatch) -> None:
+    pixels = np.array([[[10, 20, 30, 255], [40, 50, 60, 255]]], dtype=np.uint8)
+
+    cap = MiniCap.__new__(MiniCap)  # type: ignore[call-arg]
+    cap.width = 2
+    cap.height = 1
+    cap.buffer_size = pixels.nbytes
+    cap.use_stream = True
+
+    monkeypatch.setattr(
+        MiniCap, "screencap_raw_view", lambda self: memoryview(pixels.tobytes())
+    )
+
+    out = np.empty((1, 2, 3), dtype=np.uint8)
+    assert MiniCap.screencap_into(cap, out) is out
+    assert out[0, 0].tolist() == [30, 20, 10]
+    assert out[0, 1].tolist() == [60, 50, 40]
+
+    with pytest.raises(ValueError):
+        MiniCap.screencap_into(cap, np.empty((2, 2, 3), dtype=np.uint8))
+
+
+def test_minicap_get_device_props_batches_and_caches(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(MiniCap, "_DEVICE_PROPS_CACHE", {})
+    shell_calls: list = []
+
+    def fake_shell(cmd):
+        shell_calls.append(cmd)
+        return "arm64-v8a\n30\n"
+
+    cap = MiniCap.__new__(MiniCap)  # type: ignore[call-arg]
+    cap.adb = SimpleNamespace(serial="emulator-5554", shell=fake_shell)
+
+    assert MiniCap.get_device_props(cap) == ("arm64-v8a", "30")
+    assert MiniCap.get_device_props(cap) == ("arm64-v8a", "30")
+    assert len(shell_calls) == 1
+
+
+def test_minicap_screencap_rgb(monkeypatch: pytest.MonkeyPatch) -> None:
+    pixels = np.array([[[10, 20, 30, 255], [40, 50, 60, 255]]], dtype=np.uint8)
+    raw = memoryview(pixels.tobytes()).toreadonly()
+
+    cap = MiniCap.__new__(MiniCap)  # type: ignore[call-arg]
+    cap.width = 2
+    cap.height = 1
+    cap.buffer_size = pixels.nbytes
+    cap.use_stream = True
+
+    monkeypatch.setattr(MiniCap, "screencap_raw_view", lambda self: raw)
+
+    view = MiniCap.screencap_rgb_view(cap)
+    assert view.shape == (1, 2, 3)
+    assert not view.flags.c_contiguous
+    assert not view.flags.writeable
+    assert view[0, 1].tolist() == [40, 50, 60]
+
+    rgb = MiniCap.screencap_rgb(cap)
+    assert rgb.flags.c_contiguous
+    assert rgb[0, 0].tolist() == [10, 20, 30]
@@ -1,5 +1,10 @@
 import ctypes
+import functools
 import os
+import threading
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 import cv2
 import numpy as np
@@ -39,21 +44,7 @@ class MuMuCap(ScreenCap):
         self.instance_index = instance_index
         self.emulator_install_path = emulator_install_path or get_mumu_path()
 
-        uninstall_exe = os.path.join(self.emulator_install_path, "uninstall.exe")
-        if not os.path.exists(uninstall_exe):
-            raise FileNotFoundError(
-                "MuMu uninstall.exe not found; emulator installation path is invalid"
-            )
-
-        self.dllPath = dll_path or os.path.join(
-            self.emulator_install_path, self.MUMU_API_DLL_PATH
-        )
-        if not os.path.exists(self.dllPath):
-            self.dllPath = os.path.join(
-                self.emulator_install_path, self.MUMU_12_5_API_DLL_PATH
-            )
-        if not os.path.exists(self.dllPath):
-            raise FileNotFoundError("external_renderer_ipc.dll not found")
+        self.dllPath = self._resolve_dll_path(self.emulator_install_path, dll_path)
 
         self.width: int
         self.height: int
@@ -64,6 +55,30 @@ class MuMuCap(ScreenCap):
         self.handle = self.nemu.connect(self.emulator_install_path, self.instance_index)
         self.__get_display_info()
 
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _resolve_dll_path(emulator_install_path: str, dll_path: Optional[str] = None) -> str:
+        """
+        Validate the installation path and locate external_renderer_ipc.dll.
+
+        Results are cached per (install path, dll path) so repeated instances
+        skip the filesystem checks. Failures are not cached.
+        """
+        uninstall_exe = os.path.join(emulator_install_path, "uninstall.exe")
+        if not os.path.exists(uninstall_exe):
+            raise FileNotFoundError(
+                "MuMu uninstall.exe not found; emulator installation path is invalid"
+            )
+
+        resolved = dll_path or os.path.join(
+            emulator_install_path, MuMuCap.MUMU_API_DLL_PATH
+        )
+        if not os.path.exists(resolved):
+            resolved = os.path.join(emulator_install_path, MuMuCap.MUMU_12_5_API_DLL_PATH)
+        if not os.path.exists(resolved):
+            raise FileNotFoundError("external_renderer_ipc.dll not found")
+        return resolved
+
     def __get_display_info(self) -> None:
         """Query display size and allocate pixel buffer."""
         width = ctypes.c_int(0)
@@ -81,17 +96,29 @@ class MuMuCap(ScreenCap):
 
         self.width, self.height = width.value, height.value
         self.buffer_size = self.width * self.height * 4
-        self.pixels = (ctypes.c_ubyte * self.buffer_size)()
-
-    def __buffer2opencv(self) -> cv2.Mat:
-        """Convert the internal pixel buffer to an OpenCV BGR image."""
-        pixel_array = np.frombuffer(
-            self.pixels, dtype=np.uint8
-        ).reshape((self.height, self.width, 4))
-        # Flip vertically if MuMu provides an upside-down image
-        pixel_array = pixel_array[::-1, :, :]
-        # Convert from RGBA to BGR (same as ADBCap)
-        return cv2.cvtColor(pixel_array, cv2.COLOR_RGBA2BGR)
+        # Over-allocate and start the pixel buffer on a 32-byte boundary so
+        # SIMD conversion loads never split cache lines at the row start
+        self._pixels_raw = (ctypes.c_ubyte * (self.buffer_size + 32))()
+        offset = -ctypes.addressof(self._pixels_raw) & 31
+        self.pixels = (ctypes.c_ubyte * self.buffer_size).from_buffer(
+            self._pixels_raw, offset
+        )
+        # The ctypes buffer never moves, so one ndarray view serves every frame
+        self._np_view = np.frombuffer(self.pixels, dtype=np.uint8).reshape(
+            (self.height, self.width, 4)
+        )
+        self._mv = memoryview(self.pixels).cast("B")
+        # ctypes arguments for capture_display, built once instead of per frame
+        self._c_width = ctypes.c_int(self.width)
+        self._c_height = ctypes.c_int(self.height)
+
+    def __buffer2opencv(self, out: Optional[np.ndarray] = None) -> cv2.Mat:
+        """Convert the internal pixel buffer to an OpenCV BGR image, optionally into out."""
+        # Convert from RGBA to BGR (same as ADBCap) on the contiguous buffer,
+        # then flip the upside-down MuMu frame in place. Feeding cvtColor a
+        # negative-stride [::-1] view makes OpenCV copy the input first.
+        image = cv2.cvtColor(self._np_view, cv2.COLOR_RGBA2BGR, dst=out)
+        return cv2.flip(image, 0, dst=image)
 
     def close(self) -> None:
         """Disconnect from the emulator."""
@@ -108,32 +135,78 @@ class MuMuCap(ScreenCap):
     def __del__(self) -> None:
         self.close()
 
-    def screencap(self) -> cv2.Mat:
+    def __capture_frame(self) -> None:
+        """Copy the current frame from MuMu shared memory into the pixel buffer."""
         result = self.nemu.capture_display(
             self.handle,
             self.display_id,
             self.buffer_size,
-            ctypes.c_int(self.width),
-            ctypes.c_int(self.height),
+            self._c_width,
+            self._c_height,
             self.pixels,
         )
         if result > 1:
             raise BufferError("Failed to capture screen")
+
+    def screencap(self) -> cv2.Mat:
+        self.__capture_frame()
         return self.__buffer2opencv()
 
+    def screencap_into(self, out: np.ndarray) -> np.ndarray:
+        """Capture straight into a caller-owned uint8 (H, W, 3) BGR buffer."""
+        shape = (self.height, self.width, 3)
+        if out.shape != shape or out.dtype != np.uint8:
+            raise ValueError(f"Output buffer must be uint8 {shape}, got {out.dtype} {out.shape}")
+        self.__capture_frame()
+        return self.__buffer2opencv(out)
+
+    def screencap_gray(self) -> np.ndarray:
+        """Capture a single-channel grayscale image in one conversion pass."""
+        self.__capture_frame()
+        gray = cv2.cvtColor(self._np_view, cv2.COLOR_RGBA2GRAY)
+        return cv2.flip(gray, 0, dst=gray)
+
+    def screencap_raw_view(self) -> memoryview:
+        """
+        Return raw RGBA data as a view over the shared pixel buffer.
+
+        The view is valid until the next capture call.
+        """
+        self.__capture_frame()
+        return self._mv
+
     def screencap_raw(self) -> bytes:
         """Return raw RGBA bytes from MuMu shared memory."""
-        result = self.nemu.capture_display(
-            self.handle,
-            self.display_id,
-            self.buffer_size,
-            ctypes.c_int(self.width),
-            ctypes.c_int(self.height),
-            self.pixels,
-        )
-        if result > 1:
-            raise BufferError("Failed to capture screen")
-        return bytes(self.pixels)
+        return bytes(self.screencap_raw_view())
+
+
+# Shared by every screencap_many call; created on first use
+_capture_executor: Optional[ThreadPoolExecutor] = None
+_capture_executor_lock = threading.Lock()
+
+
+def _get_capture_executor() -> ThreadPoolExecutor:
+    global _capture_executor
+    with _capture_executor_lock:
+        if _capture_executor is None:
+            _capture_executor = ThreadPoolExecutor(
+                max_workers=os.cpu_count() or 1, thread_name_prefix="msc-mumu"
+            )
+        return _capture_executor
+
+
+def screencap_many(caps: Sequence[MuMuCap]) -> list[np.ndarray]:
+    """
+    Capture several MuMu instances in parallel.
+
+    capture_display and the OpenCV conversion both release the GIL, so a
+    thread per instance overlaps the shared-memory copies and conversions.
+    The worker threads are reused across calls. Results are returned in the
+    same order as caps.
+    """
+    if len(caps) <= 1:
+        return [cap.screencap() for cap in caps]
+    return list(_get_capture_executor().map(lambda cap: cap.screencap(), caps))
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@ import sys
 import ctypes
 from typing import Any
 
+import cv2
 import numpy as np
 import pytest
 
@@ -12,7 +13,15 @@ if sys.platform != "win32":
     pytest.skip("MuMu is only supported on Windows", allow_module_level=True)
 
 from msc import mumu as mumu_module
-from msc.mumu import MuMuCap
+from msc.mumu import MuMuCap, screencap_many
+
+
+@pytest.fixture(autouse=True)
+def _clear_dll_path_cache():
+    # 各测试会 monkeypatch os.path.exists，避免共享解析缓存
+    MuMuCap._resolve_dll_path.cache_clear()
+    yield
+    MuMuCap._resolve_dll_path.cache_clear()
 
 
 class FakeMuMuApi:
@@ -49,8 +58,7 @@ class FakeMuMuApi:
             [[[10, 20, 30, 255], [40, 50, 60, 255]]],
             dtype=np.uint8,
         ).tobytes()
-        for i, b in enumerate(rgba):
-            pixels[i] = b
+        ctypes.memmove(pixels, rgba, len(rgba))
         return 0
 
     def disconnect(self, handle: int) -> None:
@@ -79,6 +87,8 @@ def test_mumucap_screencap_converts_rgba_to_bgr(
     assert cap.height == 1
     assert cap.buffer_size == 2 * 1 * 4
 
+    assert ctypes.addressof(cap.pixels) % 32 == 0
+
     mat = cap.screencap()
     assert mat.shape == (1, 2, 3)
 
@@ -87,6 +97,99 @@ def test_mumucap_screencap_converts_rgba_to_bgr(
     assert mat[0, 1].tolist() == [60, 50, 40]
 
 
+def test_mumucap_screencap_raw_view(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(mumu_module, "get_mumu_path", lambda: "C:/fake/mumu")
+    real_exists = mumu_module.os.path.exists
+
+    def fake_exists(path: str) -> bool:
+        if path.endswith("uninstall.exe") or path.endswith("external_renderer_ipc.dll"):
+            return True
+        return real_exists(path)
+
+    monkeypatch.setattr(mumu_module.os.path, "exists", fake_exists)
+    monkeypatch.setattr(mumu_module, "MuMuApi", FakeMuMuApi)
+
+    cap = MuMuCap(instance_index=0)
+
+    view = cap.screencap_raw_view()
+    assert isinstance(view, memoryview)
+    assert view.tobytes() == bytes([10, 20, 30, 255, 40, 50, 60, 255])
+    # 视图直接指向共享像素缓冲区，不复制
+    assert cap.screencap_raw_view() is view
+
+    raw = cap.screencap_raw()
+    assert isinstance(raw, bytes)
+    assert raw == view.tobytes()
+
+
+def test_mumucap_screencap_into(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(mumu_module, "get_mumu_path", lambda: "C:/fake/mumu")
+    monkeypatch.setattr(mumu_module.os.path, "exists", lambda path: True)
+    monkeypatch.setattr(mumu_module, "MuMuApi", FakeMuMuApi)
+
+    cap = MuMuCap(instance_index=0)
+
+    out = np.empty((1, 2, 3), dtype=np.uint8)
+    assert cap.screencap_into(out) is out
+    assert out[0, 0].tolist() == [30, 20, 10]
+    assert out[0, 1].tolist() == [60, 50, 40]
+
+    with pytest.raises(ValueError):
+        cap.screencap_into(np.empty((2, 2, 3), dtype=np.uint8))
+
+
+def test_mumucap_screencap_gray(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(mumu_module, "get_mumu_path", lambda: "C:/fake/mumu")
+    monkeypatch.setattr(mumu_module.os.path, "exists", lambda path: True)
+    monkeypatch.setattr(mumu_module, "MuMuApi", FakeMuMuApi)
+
+    cap = MuMuCap(instance_index=0)
+
+    gray = cap.screencap_gray()
+    expected = cv2.cvtColor(cap.screencap(), cv2.COLOR_BGR2GRAY)
+    assert gray.shape == (1, 2)
+    assert np.array_equal(gray, expected)
+
+
+def test_screencap_many(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(mumu_module, "get_mumu_path", lambda: "C:/fake/mumu")
+    monkeypatch.setattr(mumu_module.os.path, "exists", lambda path: True)
+    monkeypatch.setattr(mumu_module, "MuMuApi", FakeMuMuApi)
+
+    caps = [MuMuCap(instance_index=i) for i in range(3)]
+
+    frames = screencap_many(caps)
+    assert len(frames) == 3
+    for cap, frame in zip(caps, frames):
+        assert np.array_equal(frame, cap.screencap())
+    # 每个实例返回独立的数组
+    assert frames[0] is not frames[1]
+    assert screencap_many([]) == []
+
+    # 重复调用复用同一个线程池
+    executor = mumu_module._get_capture_executor()
+    screencap_many(caps)
+    assert mumu_module._get_capture_executor() is executor
+
+
+def test_mumucap_resolve_dll_path_is_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    checked: list[str] = []
+
+    def fake_exists(path: str) -> bool:
+        checked.append(path)
+        return True
+
+    monkeypatch.setattr(mumu_module.os.path, "exists", fake_exists)
+
+    first = MuMuCap._resolve_dll_path("C:/fake/mumu")
+    calls = len(checked)
+    second = MuMuCap._resolve_dll_path("C:/fake/mumu")
+
+    assert first == second
+    assert first.endswith("external_renderer_ipc.dll")
+    assert len(checked) == calls
+
+
 def test_mumucap_disconnect_on_del(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(mumu_module, "get_mumu_path", lambda: "C:/fake/mumu")
     real_exists = mumu_module.os.path.exists
@@ -108,3 +211,22 @@ def test_mumucap_disconnect_on_del(monkeypatch: pytest.MonkeyPatch) -> None:
     cap.__del__()
 
     assert fake_api.disconnected_handle == handle
+
+
+def test_mumucap_context_manager(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(mumu_module, "get_mumu_path", lambda: "C:/fake/mumu")
+    monkeypatch.setattr(mumu_module.os.path, "exists", lambda path: True)
+
+    disconnects: list[int] = []
+    fake_api = FakeMuMuApi("dummy.dll")
+    fake_api.disconnect = disconnects.append  # type: ignore[method-assign]
+    monkeypatch.setattr(mumu_module, "MuMuApi", lambda dll_path: fake_api)
+
+    with MuMuCap(instance_index=0) as cap:
+        assert cap.screencap().shape == (1, 2, 3)
+
+    # 重复关闭与析构不会再次断开
+    cap.close()
+    cap.__del__()
+
+    assert disconnects == [123]
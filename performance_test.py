@@ -0,0 +1,424 @@
+"""
+MSC 截图方案性能测试
+
+对 ADBCap / ADBBlitz / DroidCast / MiniCap 在同一台设备上逐一测量初始化耗时、
+首帧耗时与稳态截图延迟，并输出 JSON 与 Markdown 报告。
+
+用法:
+    python performance_test.py
+    python performance_test.py --iterations 100 --warmup 5
+
+测量说明:
+    单帧耗时由阻塞的 cap.screencap() 设备往返主导 (I/O 受限)，统计部分只是对
+    不超过 iterations 个延迟做一次 O(N) 汇总。优化应针对计时循环内的额外开销和
+    各方案之间重复的 Python 逻辑，而不是统计计算本身。
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+from adbutils import adb
+
+from msc.adbblitz import ADBBlitz
+from msc.adbcap import ADBCap
+from msc.droidcast import DroidCast
+from msc.minicap import MiniCap
+
+# 参与测试的方案，对应 PerformanceTester.test_<name>
+BACKENDS = ("adbcap", "adbblitz", "droidcast", "minicap")
+
+# streaming 模式下用于估算分位数的蓄水池样本上限
+RESERVOIR_SIZE = 10_000
+
+# (平均, 标准差, 最小, 中位数, P95, P99, 最大)，单位 ms
+LatencyStats = Tuple[float, float, float, float, float, float, float]
+
+
+@dataclass
+class PerformanceMetrics:
+    """单个截图方案的性能指标"""
+
+    method: str
+    init_time_ms: float
+    first_frame_ms: float
+    avg_latency_ms: float
+    min_latency_ms: float
+    max_latency_ms: float
+    median_latency_ms: float
+    std_latency_ms: float
+    p95_latency_ms: float
+    p99_latency_ms: float
+    fps: float
+    success_rate: float
+    image_size_kb: float
+    # float64 数组，比 Python float 列表节省约 3.5 倍内存；streaming 模式下为 None
+    latencies_ms: Optional[np.ndarray] = None
+
+    def to_dict(self) -> dict:
+        """转换为报告用字典，不包含逐帧延迟"""
+        # 手动构造，避免 asdict 深拷贝逐帧延迟列表
+        return {
+            "method": self.method,
+            "init_time_ms": self.init_time_ms,
+            "first_frame_ms": self.first_frame_ms,
+            "avg_latency_ms": self.avg_latency_ms,
+            "min_latency_ms": self.min_latency_ms,
+            "max_latency_ms": self.max_latency_ms,
+            "median_latency_ms": self.median_latency_ms,
+            "std_latency_ms": self.std_latency_ms,
+            "p95_latency_ms": self.p95_latency_ms,
+            "p99_latency_ms": self.p99_latency_ms,
+            "fps": self.fps,
+            "success_rate": self.success_rate,
+            "image_size_kb": self.image_size_kb,
+        }
+
+
+def run_benchmark(
+    name: str,
+    factory: Callable[[], Any],
+    iterations: int = 50,
+    warmup: int = 3,
+    precheck: Optional[Callable[[], bool]] = None,
+    streaming: bool = False,
+) -> Optional[PerformanceMetrics]:
+    """
+    对单个截图方案执行初始化、首帧、预热和计时截图
+
+    PerformanceTester 与 test_adbblitz.py 共用此函数，计时逻辑只维护一份。
+
+    Args:
+        name (str): 方案名称
+        factory (Callable[[], Any]): 无参函数，返回截图实例
+        iterations (int, optional): 计时截图次数. Defaults to 50.
+        warmup (int, optional): 计时前的预热截图次数. Defaults to 3.
+        precheck (Callable[[], bool], optional): 返回 False 时跳过该方案. Defaults to None.
+        streaming (bool, optional): 单遍统计而不保留逐帧延迟. Defaults to False.
+
+    Returns:
+        Optional[PerformanceMetrics]: 跳过或初始化失败时返回 None
+    """
+    if precheck is not None and not precheck():
+        print(f"\n[{name}] 跳过: 当前设备不支持")
+        return None
+    print(f"\n[{name}] 开始测试")
+    try:
+        t0 = time.perf_counter_ns()
+        cap = factory()
+        init_time_ms = (time.perf_counter_ns() - t0) * 1e-6
+    except Exception as e:
+        print(f"[{name}] 初始化失败: {e}")
+        return None
+
+    # 实例创建后无论首帧是否成功都要关闭，避免残留设备端进程与端口转发
+    try:
+        try:
+            t0 = time.perf_counter_ns()
+            first_img = cap.screencap()
+            first_frame_ms = (time.perf_counter_ns() - t0) * 1e-6
+        except Exception as e:
+            print(f"[{name}] 首帧截图失败: {e}")
+            return None
+
+        if streaming:
+            n_ok, failed, stats, valid_ms = _measure_streaming(cap, iterations, warmup)
+        else:
+            n_ok, failed, stats, valid_ms = _measure_buffered(cap, iterations, warmup)
+    finally:
+        cap.close()
+    if warmup + iterations >= 32:
+        sys.stdout.write("\n")
+
+    if n_ok == 0:
+        print(f"[{name}] 所有截图均失败")
+        return None
+
+    avg, std, mn, med, p95, p99, mx = stats
+    metrics = PerformanceMetrics(
+        method=name,
+        init_time_ms=init_time_ms,
+        first_frame_ms=first_frame_ms,
+        avg_latency_ms=avg,
+        min_latency_ms=mn,
+        max_latency_ms=mx,
+        median_latency_ms=med,
+        std_latency_ms=std,
+        p95_latency_ms=p95,
+        p99_latency_ms=p99,
+        fps=1000.0 / avg if avg > 0 else 0.0,
+        success_rate=n_ok / iterations * 100,
+        # 各方案返回解码后的定长 BGR 图像，首帧大小即每帧大小
+        image_size_kb=first_img.nbytes / 1024,
+        latencies_ms=valid_ms,
+    )
+    print(
+        f"[{name}] 成功 {n_ok}/{iterations}, 失败 {failed}, "
+        f"平均 {metrics.avg_latency_ms:.2f}ms, "
+        f"P95 {metrics.p95_latency_ms:.2f}ms, FPS {metrics.fps:.1f}, "
+        f"首帧 {first_img.shape}"
+    )
+    return metrics
+
+
+def _progress(done: int, total: int) -> None:
+    sys.stdout.write(f"\r  进度: {done}/{total}")
+    sys.stdout.flush()
+
+
+def _measure_buffered(
+    cap: Any, iterations: int, warmup: int
+) -> Tuple[int, int, Optional[LatencyStats], np.ndarray]:
+    """
+    预热并计时截图，保留全部延迟，返回 (成功数, 失败数, 统计值, 逐帧延迟ms)
+
+    预热与计时共用一个循环，预热部分的结果在循环结束后丢弃。
+    """
+    total = warmup + iterations
+    # 成功的帧紧凑写入缓冲区前 n_ok 项，无需事后过滤
+    latencies_ns = np.empty(total, dtype=np.int64)
+    n_ok = 0
+    failed = 0
+    warm_ok = 0
+    for i in range(total):
+        if i == warmup:
+            # 预热结束：此后的成功帧与失败数才计入结果
+            warm_ok = n_ok
+            failed = 0
+        try:
+            t0 = time.perf_counter_ns()
+            cap.screencap()
+            latencies_ns[n_ok] = time.perf_counter_ns() - t0
+            n_ok += 1
+        except Exception:
+            failed += 1
+        # 每 32 帧原地刷新一次进度，避免逐行打印干扰下一次计时
+        if (i & 0x1F) == 0x1F:
+            _progress(i + 1, total)
+
+    valid_ms = latencies_ns[warm_ok:n_ok].astype(np.float64) * 1e-6
+    n_ok -= warm_ok
+    if n_ok == 0:
+        return n_ok, failed, None, valid_ms
+    # 一次排序得到全部分位数
+    mn, med, p95, p99, mx = np.quantile(valid_ms, [0.0, 0.5, 0.95, 0.99, 1.0]).tolist()
+    stats = (float(valid_ms.mean()), float(valid_ms.std()), mn, med, p95, p99, mx)
+    return n_ok, failed, stats, valid_ms
+
+
+def _measure_streaming(
+    cap: Any, iterations: int, warmup: int
+) -> Tuple[int, int, Optional[LatencyStats], None]:
+    """
+    计时截图但不保留全部延迟，内存占用与迭代次数无关
+
+    均值与标准差使用 Welford 单遍算法精确计算，最值直接跟踪；
+    中位数与 P95/P99 由固定大小的蓄水池样本估算。预热帧在同一循环中执行但不计入统计。
+    """
+    total = warmup + iterations
+    reservoir = np.empty(min(iterations, RESERVOIR_SIZE), dtype=np.float64)
+    capacity = len(reservoir)
+    n_ok = 0
+    failed = 0
+    mean = 0.0
+    m2 = 0.0
+    mn = math.inf
+    mx = -math.inf
+    for i in range(total):
+        if i == warmup:
+            failed = 0
+        try:
+            t0 = time.perf_counter_ns()
+            cap.screencap()
+            x = (time.perf_counter_ns() - t0) * 1e-6
+        except Exception:
+            failed += 1
+        else:
+            if i >= warmup:
+                n_ok += 1
+                d = x - mean
+                mean += d / n_ok
+                m2 += d * (x - mean)
+                if x < mn:
+                    mn = x
+                if x > mx:
+                    mx = x
+                if n_ok <= capacity:
+                    reservoir[n_ok - 1] = x
+                else:
+                    j = random.randrange(n_ok)
+                    if j < capacity:
+                        reservoir[j] = x
+        if (i & 0x1F) == 0x1F:
+            _progress(i + 1, total)
+
+    if n_ok == 0:
+        return n_ok, failed, None, None
+    sample = reservoir[: min(n_ok, capacity)]
+    med, p95, p99 = np.quantile(sample, [0.5, 0.95, 0.99]).tolist()
+    # 与 np.std 一致使用总体标准差
+    stats = (mean, math.sqrt(m2 / n_ok), mn, med, p95, p99, mx)
+    return n_ok, failed, stats, None
+
+
+class PerformanceTester:
+    """截图方案性能测试器"""
+
+    def __init__(
+        self,
+        serial: Optional[str] = None,
+        iterations: int = 50,
+        warmup: int = 3,
+        streaming: bool = False,
+        isolate: bool = True,
+    ):
+        """
+        Args:
+            serial (str, optional): 设备id，默认使用第一台已连接设备.
+            iterations (int, optional): 每个方案的计时截图次数. Defaults to 50.
+            warmup (int, optional): 计时前的预热截图次数. Defaults to 3.
+            streaming (bool, optional): 单遍统计而不保留逐帧延迟，适合超长测试. Defaults to False.
+            isolate (bool, optional): 每个方案在独立的 spawn 子进程中测试. Defaults to True.
+        """
+        self.serial = serial or adb.device_list()[0].serial
+        self.iterations = iterations
+        self.warmup = warmup
+        self.streaming = streaming
+        self.isolate = isolate
+        self.sdk = int(adb.device(self.serial).getprop("ro.build.version.sdk"))
+        self.results: List[PerformanceMetrics] = []
+
+    def _run_benchmark(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        precheck: Optional[Callable[[], bool]] = None,
+    ) -> Optional[PerformanceMetrics]:
+        return run_benchmark(name, factory, self.iterations, self.warmup, precheck, self.streaming)
+
+    def test_adbcap(self) -> Optional[PerformanceMetrics]:
+        return self._run_benchmark("ADBCap", lambda: ADBCap(self.serial))
+
+    def test_adbblitz(self) -> Optional[PerformanceMetrics]:
+        return self._run_benchmark("ADBBlitz", lambda: ADBBlitz(self.serial))
+
+    def test_droidcast(self) -> Optional[PerformanceMetrics]:
+        return self._run_benchmark("DroidCast", lambda: DroidCast(self.serial))
+
+    def test_minicap(self) -> Optional[PerformanceMetrics]:
+        # minicap 最高支持 Android 14 (SDK 34)
+        return self._run_benchmark(
+            "MiniCap", lambda: MiniCap(self.serial), precheck=lambda: self.sdk <= 34
+        )
+
+    def run_all_tests(self) -> List[PerformanceMetrics]:
+        """依次测试所有截图方案"""
+        print(f"设备: {self.serial} (SDK {self.sdk})")
+        print(f"迭代次数: {self.iterations}, 预热次数: {self.warmup}")
+        for backend in BACKENDS:
+            if self.isolate:
+                # 每个方案在全新的解释器中测量，避免上一个方案的线程、套接字与内存状态
+                # 影响本次结果；进程池大小为 1，保证同一时刻只有一个方案访问设备
+                with multiprocessing.get_context("spawn").Pool(1) as pool:
+                    metrics = pool.apply(
+                        _run_backend,
+                        (backend, self.serial, self.iterations, self.warmup, self.streaming),
+                    )
+            else:
+                metrics = getattr(self, f"test_{backend}")()
+            if metrics is not None:
+                self.results.append(metrics)
+        return self.results
+
+    def generate_report(self, output_dir: str = ".") -> None:
+        """生成 performance_report.json、latency_distribution.json 与 performance_report.md"""
+        os.makedirs(output_dir, exist_ok=True)
+        # JSON 与 Markdown 报告共用同一时间戳
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+
+        report = {
+            "timestamp": timestamp,
+            "serial": self.serial,
+            "sdk": self.sdk,
+            "iterations": self.iterations,
+            "warmup": self.warmup,
+            "results": [m.to_dict() for m in self.results],
+        }
+        # 先在内存中拼好完整内容，每个文件只写入一次
+        with open(os.path.join(output_dir, "performance_report.json"), "w", encoding="utf-8") as f:
+            f.write(json.dumps(report, indent=2, ensure_ascii=False))
+
+        distribution = {
+            m.method: {"latencies": m.latencies_ms.tolist()}
+            for m in self.results
+            if m.latencies_ms is not None
+        }
+        # 逐帧数据不缩进：indent 会让每个数值单独占一行
+        with open(os.path.join(output_dir, "latency_distribution.json"), "w", encoding="utf-8") as f:
+            f.write(json.dumps(distribution, ensure_ascii=False))
+
+        ranked = sorted(self.results, key=lambda m: m.avg_latency_ms)
+        lines: List[str] = [
+            "# MSC 截图性能测试报告\n\n",
+            f"- 时间: {timestamp}\n",
+            f"- 设备: {self.serial} (SDK {self.sdk})\n",
+            f"- 迭代次数: {self.iterations}, 预热次数: {self.warmup}\n\n",
+            "## 汇总\n\n",
+            "| 方案 | 平均(ms) | 中位数(ms) | P95(ms) | P99(ms) | FPS | 成功率 |\n",
+            "|------|----------|------------|---------|---------|-----|--------|\n",
+        ]
+        for m in ranked:
+            lines.append(
+                f"| {m.method} | {m.avg_latency_ms:.2f} | {m.median_latency_ms:.2f} | "
+                f"{m.p95_latency_ms:.2f} | {m.p99_latency_ms:.2f} | {m.fps:.1f} | "
+                f"{m.success_rate:.1f}% |\n"
+            )
+        lines.append("\n## 详细指标\n")
+        for m in ranked:
+            lines.append(f"\n### {m.method}\n\n")
+            lines.append(f"- 初始化耗时: {m.init_time_ms:.2f}ms\n")
+            lines.append(f"- 首帧耗时: {m.first_frame_ms:.2f}ms\n")
+            lines.append(f"- 延迟范围: {m.min_latency_ms:.2f} - {m.max_latency_ms:.2f}ms\n")
+            lines.append(f"- 标准差: {m.std_latency_ms:.2f}ms\n")
+            lines.append(f"- 图像大小: {m.image_size_kb:.1f}KB\n")
+        with open(os.path.join(output_dir, "performance_report.md"), "w", encoding="utf-8") as f:
+            f.write("".join(lines))
+
+        print(f"\n报告已保存至 {os.path.abspath(output_dir)}")
+
+
+def _run_backend(
+    backend: str, serial: str, iterations: int, warmup: int, streaming: bool
+) -> Optional[PerformanceMetrics]:
+    """子进程入口：在新的解释器中测试单个方案"""
+    tester = PerformanceTester(serial, iterations, warmup, streaming, isolate=False)
+    return getattr(tester, f"test_{backend}")()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MSC 截图方案性能测试")
+    parser.add_argument("--serial", default=None, help="设备id，默认使用第一台设备")
+    parser.add_argument("--iterations", type=int, default=50, help="每个方案的计时截图次数")
+    parser.add_argument("--warmup", type=int, default=3, help="计时前的预热截图次数")
+    parser.add_argument("--streaming", action="store_true", help="单遍统计，不保留逐帧延迟")
+    parser.add_argument("--no-isolate", action="store_true", help="在当前进程中依次测试所有方案")
+    parser.add_argument("--output-dir", default=".", help="报告输出目录")
+    args = parser.parse_args()
+
+    tester = PerformanceTester(
+        args.serial, args.iterations, args.warmup, args.streaming, isolate=not args.no_isolate
+    )
+    tester.run_all_tests()
+    tester.generate_report(args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
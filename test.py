@@ -0,0 +1,41 @@
+"""
+快速测试所有截图方案，每个方案保存一张截图到当前目录
+
+用法:
+    python test.py
+"""
+
+from adbutils import adb
+
+from msc.adbblitz import ADBBlitz
+from msc.adbcap import ADBCap
+from msc.droidcast import DroidCast
+from msc.minicap import MiniCap
+
+
+def main() -> None:
+    # 只查询一次设备列表，每次查询都是一次 adb 往返
+    serial = adb.device_list()[0].serial
+
+    backends = (
+        ("adb.png", ADBCap),
+        ("adbblitz.png", ADBBlitz),
+        ("droidcast.png", DroidCast),
+        ("minicap.png", MiniCap),
+    )
+    for filename, cls in backends:
+        cap = None
+        try:
+            cap = cls(serial)
+            cap.save_screencap(filename)
+            print(f"✓ {cls.__name__}: {filename}")
+        except Exception as e:
+            # 单个方案失败不影响其余方案
+            print(f"✗ {cls.__name__}: {e}")
+        finally:
+            if cap is not None:
+                cap.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+ADBBlitz 快速功能测试 (需要已连接的设备)
+
+用法:
+    python test_adbblitz.py
+"""
+
+import sys
+import time
+from itertools import islice
+
+from adbutils import adb
+
+from msc.adbblitz import ADBBlitz
+from performance_test import run_benchmark
+
+
+def check_basic(cap: ADBBlitz) -> None:
+    t0 = time.perf_counter_ns()
+    image = cap.screencap()
+    elapsed_ms = (time.perf_counter_ns() - t0) * 1e-6
+    assert image.ndim == 3 and image.shape[2] == 3, f"图像格式错误: {image.shape}"
+    print(f"✓ 测试 1: 基本截图功能 ({elapsed_ms:.0f}ms)")
+
+
+def check_performance(serial: str) -> None:
+    # 与 performance_test.py 共用计时与统计逻辑
+    metrics = run_benchmark("ADBBlitz", lambda: ADBBlitz(serial), iterations=10, warmup=3)
+    assert metrics is not None, "连续截图全部失败"
+    print(f"✓ 测试 2: 连续截图性能测试 (avg: {metrics.avg_latency_ms:.0f}ms, FPS: {metrics.fps:.0f})")
+
+
+def check_stream(cap: ADBBlitz, frames: int = 5) -> None:
+    t0 = time.perf_counter_ns()
+    count = sum(1 for _ in islice(cap, frames))
+    elapsed_s = (time.perf_counter_ns() - t0) * 1e-9
+    assert count == frames, f"仅收到 {count}/{frames} 帧"
+    print(f"✓ 测试 3: 流式迭代器测试 ({count} frames, FPS: {count / elapsed_s:.0f})")
+
+
+def check_raw(cap: ADBBlitz) -> None:
+    image = cap.screencap()
+    raw = cap.screencap_raw()
+    height, width = image.shape[:2]
+    assert len(raw) == width * height * 4, f"原始数据长度错误: {len(raw)}"
+    print("✓ 测试 4: 原始字节数据测试 (RGBA format)")
+
+
+def main() -> int:
+    serial = adb.device_list()[0].serial
+    try:
+        with ADBBlitz(serial) as cap:
+            check_basic(cap)
+        # run_benchmark 自行创建实例，避免与其他实例同时占用 screenrecord
+        check_performance(serial)
+        with ADBBlitz(serial) as cap:
+            check_stream(cap)
+            check_raw(cap)
+    except Exception as e:
+        print(f"✗ 测试失败: {e}")
+        return 1
+    print("✓ 所有测试通过!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())